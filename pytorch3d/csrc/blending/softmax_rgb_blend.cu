@@ -0,0 +1,364 @@
+// Copyright (c) Facebook, Inc. and its affiliates. All rights reserved.
+
+#include <ATen/cuda/CUDAContext.h>
+#include <c10/cuda/CUDAGuard.h>
+#include <torch/extension.h>
+#include <cmath>
+#include <tuple>
+
+// Weight for the background color and minimum value of z_inv_max.
+// This must match the value used in the PyTorch implementation.
+#define SOFTMAX_BLEND_EPS 1e-10
+
+template <typename scalar_t>
+__global__ void SoftmaxRGBBlendForwardKernel(
+    // clang-format off
+    const torch::PackedTensorAccessor<scalar_t, 5, torch::RestrictPtrTraits, size_t> colors, // (N, H, W, K, 3)
+    const torch::PackedTensorAccessor<scalar_t, 4, torch::RestrictPtrTraits, size_t> distances, // (N, H, W, K)
+    const torch::PackedTensorAccessor<scalar_t, 4, torch::RestrictPtrTraits, size_t> zbuf, // (N, H, W, K)
+    const torch::PackedTensorAccessor<int64_t, 4, torch::RestrictPtrTraits, size_t> pix_to_face, // (N, H, W, K)
+    const torch::PackedTensorAccessor<scalar_t, 1, torch::RestrictPtrTraits, size_t> background, // (3)
+    torch::PackedTensorAccessor<scalar_t, 4, torch::RestrictPtrTraits, size_t> pixel_colors, // (N, H, W, 4)
+    torch::PackedTensorAccessor<scalar_t, 3, torch::RestrictPtrTraits, size_t> z_inv_max, // (N, H, W)
+    torch::PackedTensorAccessor<scalar_t, 3, torch::RestrictPtrTraits, size_t> denoms, // (N, H, W)
+    // clang-format on
+    const scalar_t sigma,
+    const scalar_t gamma,
+    const scalar_t znear,
+    const scalar_t zfar,
+    const int N,
+    const int H,
+    const int W,
+    const int K) {
+  // Parallelize over each pixel in images of
+  // size H * W, for each image in the batch of size N.
+  const int num_threads = gridDim.x * blockDim.x;
+  const int tid = blockIdx.x * blockDim.x + threadIdx.x;
+  const scalar_t eps = SOFTMAX_BLEND_EPS;
+
+  for (int t_i = tid; t_i < N * H * W; t_i += num_threads) {
+    // Convert linear index to 3D index
+    const int n = t_i / (H * W); // batch index.
+    const int pix_idx = t_i % (H * W);
+    const int yi = pix_idx / W;
+    const int xi = pix_idx % W;
+
+    // First loop over K: find the max inverse depth to stabilize the
+    // exponential. Padded faces have z_inv = 0, so starting from eps
+    // gives the same result as the clamp in the PyTorch version.
+    scalar_t zmax = eps;
+    for (int k = 0; k < K; k++) {
+      if (pix_to_face[n][yi][xi][k] < 0) {
+        // Sentinel value is -1 indicating no face overlaps the pixel.
+        continue;
+      }
+      const scalar_t z_inv = (zfar - zbuf[n][yi][xi][k]) / (zfar - znear);
+      zmax = z_inv > zmax ? z_inv : zmax;
+    }
+
+    // Second loop over K: accumulate the alpha product, the softmax
+    // denominator and the weighted colors in registers.
+    scalar_t alpha = 1.0;
+    scalar_t denom = 0.0;
+    scalar_t r = 0.0, g = 0.0, b = 0.0;
+    for (int k = 0; k < K; k++) {
+      if (pix_to_face[n][yi][xi][k] < 0) {
+        continue;
+      }
+      // The distance is negative if a pixel is inside a face and positive
+      // outside the face, so prob = sigmoid(-dist / sigma).
+      const scalar_t prob = 1. / (1. + exp(distances[n][yi][xi][k] / sigma));
+      alpha *= (1.0 - prob);
+      const scalar_t z_inv = (zfar - zbuf[n][yi][xi][k]) / (zfar - znear);
+      const scalar_t weight = prob * exp((z_inv - zmax) / gamma);
+      denom += weight;
+      r += weight * colors[n][yi][xi][k][0];
+      g += weight * colors[n][yi][xi][k][1];
+      b += weight * colors[n][yi][xi][k][2];
+    }
+
+    // Exp normalize trick for the background color weight.
+    // Clamp to ensure delta is never 0.
+    scalar_t delta = exp((eps - zmax) / gamma);
+    delta = delta < eps ? eps : delta;
+    denom += delta;
+
+    pixel_colors[n][yi][xi][0] = (r + delta * background[0]) / denom;
+    pixel_colors[n][yi][xi][1] = (g + delta * background[1]) / denom;
+    pixel_colors[n][yi][xi][2] = (b + delta * background[2]) / denom;
+    pixel_colors[n][yi][xi][3] = 1.0 - alpha;
+    z_inv_max[n][yi][xi] = zmax;
+    denoms[n][yi][xi] = denom;
+  }
+}
+
+std::tuple<at::Tensor, at::Tensor, at::Tensor> SoftmaxRGBBlendForwardCuda(
+    const at::Tensor& colors, // (N, H, W, K, 3)
+    const at::Tensor& distances, // (N, H, W, K)
+    const at::Tensor& zbuf, // (N, H, W, K)
+    const at::Tensor& pix_to_face, // (N, H, W, K)
+    const at::Tensor& background, // (3)
+    const double sigma,
+    const double gamma,
+    const double znear,
+    const double zfar) {
+  const int N = pix_to_face.size(0);
+  const int H = pix_to_face.size(1);
+  const int W = pix_to_face.size(2);
+  const int K = pix_to_face.size(3);
+
+  at::Tensor pixel_colors = at::zeros({N, H, W, 4}, colors.options());
+  at::Tensor z_inv_max = at::zeros({N, H, W}, colors.options());
+  at::Tensor denom = at::zeros({N, H, W}, colors.options());
+  const size_t blocks = 1024;
+  const size_t threads = 128;
+
+  // Check inputs are on the same device
+  at::TensorArg colors_t{colors, "colors", 1},
+      distances_t{distances, "distances", 2}, zbuf_t{zbuf, "zbuf", 3},
+      pix_to_face_t{pix_to_face, "pix_to_face", 4},
+      background_t{background, "background", 5};
+  at::CheckedFrom c = "SoftmaxRGBBlendForwardCuda";
+  at::checkAllSameGPU(
+      c, {colors_t, distances_t, zbuf_t, pix_to_face_t, background_t});
+
+  // Set the device for the kernel launch based on the device of colors
+  at::cuda::CUDAGuard device_guard(colors.device());
+  cudaStream_t stream = at::cuda::getCurrentCUDAStream();
+
+  if (pix_to_face.numel() == 0) {
+    AT_CUDA_CHECK(cudaGetLastError());
+    return std::make_tuple(pixel_colors, z_inv_max, denom);
+  }
+
+  AT_DISPATCH_FLOATING_TYPES(
+      colors.scalar_type(), "softmax_rgb_blend_kernel", ([&] {
+        // clang-format off
+      SoftmaxRGBBlendForwardKernel<scalar_t><<<blocks, threads, 0, stream>>>(
+      colors.packed_accessor<scalar_t, 5, torch::RestrictPtrTraits, size_t>(),
+      distances.packed_accessor<scalar_t, 4, torch::RestrictPtrTraits, size_t>(),
+      zbuf.packed_accessor<scalar_t, 4, torch::RestrictPtrTraits, size_t>(),
+      pix_to_face.packed_accessor<int64_t, 4, torch::RestrictPtrTraits, size_t>(),
+      background.packed_accessor<scalar_t, 1, torch::RestrictPtrTraits, size_t>(),
+      pixel_colors.packed_accessor<scalar_t, 4, torch::RestrictPtrTraits, size_t>(),
+      z_inv_max.packed_accessor<scalar_t, 3, torch::RestrictPtrTraits, size_t>(),
+      denom.packed_accessor<scalar_t, 3, torch::RestrictPtrTraits, size_t>(),
+      sigma,
+      gamma,
+      znear,
+      zfar,
+      N,
+      H,
+      W,
+      K);
+        // clang-format on
+      }));
+
+  AT_CUDA_CHECK(cudaGetLastError());
+  return std::make_tuple(pixel_colors, z_inv_max, denom);
+}
+
+template <typename scalar_t>
+__global__ void SoftmaxRGBBlendBackwardKernel(
+    // clang-format off
+    const torch::PackedTensorAccessor<scalar_t, 4, torch::RestrictPtrTraits, size_t> grad_pixel_colors, // (N, H, W, 4)
+    const torch::PackedTensorAccessor<scalar_t, 4, torch::RestrictPtrTraits, size_t> pixel_colors, // (N, H, W, 4)
+    const torch::PackedTensorAccessor<scalar_t, 3, torch::RestrictPtrTraits, size_t> z_inv_max, // (N, H, W)
+    const torch::PackedTensorAccessor<scalar_t, 3, torch::RestrictPtrTraits, size_t> denoms, // (N, H, W)
+    const torch::PackedTensorAccessor<scalar_t, 5, torch::RestrictPtrTraits, size_t> colors, // (N, H, W, K, 3)
+    const torch::PackedTensorAccessor<scalar_t, 4, torch::RestrictPtrTraits, size_t> distances, // (N, H, W, K)
+    const torch::PackedTensorAccessor<scalar_t, 4, torch::RestrictPtrTraits, size_t> zbuf, // (N, H, W, K)
+    const torch::PackedTensorAccessor<int64_t, 4, torch::RestrictPtrTraits, size_t> pix_to_face, // (N, H, W, K)
+    const torch::PackedTensorAccessor<scalar_t, 1, torch::RestrictPtrTraits, size_t> background, // (3)
+    torch::PackedTensorAccessor<scalar_t, 5, torch::RestrictPtrTraits, size_t> grad_colors, // (N, H, W, K, 3)
+    torch::PackedTensorAccessor<scalar_t, 4, torch::RestrictPtrTraits, size_t> grad_distances, // (N, H, W, K)
+    torch::PackedTensorAccessor<scalar_t, 4, torch::RestrictPtrTraits, size_t> grad_zbuf, // (N, H, W, K)
+    // clang-format on
+    const scalar_t sigma,
+    const scalar_t gamma,
+    const scalar_t znear,
+    const scalar_t zfar,
+    const int N,
+    const int H,
+    const int W,
+    const int K) {
+  // Parallelize over each pixel in images of
+  // size H * W, for each image in the batch of size N.
+  const int num_threads = gridDim.x * blockDim.x;
+  const int tid = blockIdx.x * blockDim.x + threadIdx.x;
+  const scalar_t eps = SOFTMAX_BLEND_EPS;
+
+  for (int t_i = tid; t_i < N * H * W; t_i += num_threads) {
+    // Convert linear index to 3D index
+    const int n = t_i / (H * W); // batch index.
+    const int pix_idx = t_i % (H * W);
+    const int yi = pix_idx / W;
+    const int xi = pix_idx % W;
+
+    const scalar_t zmax = z_inv_max[n][yi][xi];
+    const scalar_t denom = denoms[n][yi][xi];
+    // 1.0 - alpha is the product of (1.0 - prob) over K.
+    const scalar_t alpha = 1.0 - pixel_colors[n][yi][xi][3];
+    const scalar_t grad_alpha = grad_pixel_colors[n][yi][xi][3];
+    const scalar_t grad_r = grad_pixel_colors[n][yi][xi][0];
+    const scalar_t grad_g = grad_pixel_colors[n][yi][xi][1];
+    const scalar_t grad_b = grad_pixel_colors[n][yi][xi][2];
+    // dot(grad_rgb, rgb) is shared by the gradient of every weight.
+    const scalar_t grad_dot_rgb = grad_r * pixel_colors[n][yi][xi][0] +
+        grad_g * pixel_colors[n][yi][xi][1] +
+        grad_b * pixel_colors[n][yi][xi][2];
+
+    // First loop over K: gradient flowing into z_inv_max through the
+    // weights, and the face which attains the max.
+    scalar_t grad_zmax = 0.0;
+    scalar_t z_best = eps;
+    int k_max = -1;
+    for (int k = 0; k < K; k++) {
+      if (pix_to_face[n][yi][xi][k] < 0) {
+        continue;
+      }
+      const scalar_t prob = 1. / (1. + exp(distances[n][yi][xi][k] / sigma));
+      const scalar_t z_inv = (zfar - zbuf[n][yi][xi][k]) / (zfar - znear);
+      const scalar_t weight = prob * exp((z_inv - zmax) / gamma);
+      // d_rgb / d_weight = (color - rgb) / denom
+      const scalar_t grad_weight = (grad_r * colors[n][yi][xi][k][0] +
+                                    grad_g * colors[n][yi][xi][k][1] +
+                                    grad_b * colors[n][yi][xi][k][2] -
+                                    grad_dot_rgb) /
+          denom;
+      grad_zmax -= grad_weight * weight / gamma;
+      if (z_inv > z_best) {
+        z_best = z_inv;
+        k_max = k;
+      }
+    }
+
+    // The background weight only depends on z_inv_max if it is not clamped.
+    const scalar_t delta = exp((eps - zmax) / gamma);
+    if (delta >= eps) {
+      // d_rgb / d_delta = (background - rgb) / denom
+      const scalar_t grad_delta = (grad_r * background[0] +
+                                   grad_g * background[1] +
+                                   grad_b * background[2] - grad_dot_rgb) /
+          denom;
+      grad_zmax -= grad_delta * delta / gamma;
+    }
+
+    // Second loop over K: write out the gradients for each face.
+    for (int k = 0; k < K; k++) {
+      if (pix_to_face[n][yi][xi][k] < 0) {
+        continue;
+      }
+      const scalar_t prob = 1. / (1. + exp(distances[n][yi][xi][k] / sigma));
+      const scalar_t z_inv = (zfar - zbuf[n][yi][xi][k]) / (zfar - znear);
+      const scalar_t exp_z = exp((z_inv - zmax) / gamma);
+      const scalar_t weight = prob * exp_z;
+      const scalar_t grad_weight = (grad_r * colors[n][yi][xi][k][0] +
+                                    grad_g * colors[n][yi][xi][k][1] +
+                                    grad_b * colors[n][yi][xi][k][2] -
+                                    grad_dot_rgb) /
+          denom;
+
+      grad_colors[n][yi][xi][k][0] = grad_r * weight / denom;
+      grad_colors[n][yi][xi][k][1] = grad_g * weight / denom;
+      grad_colors[n][yi][xi][k][2] = grad_b * weight / denom;
+
+      // d_prob / d_dist = (-1.0 / sigma) * prob * (1.0 - prob) and
+      // d_alpha / d_prob = prod_{j != k} (1.0 - prob_j), which gives
+      // d_alpha / d_dist = (-1.0 / sigma) * prob * prod_j (1.0 - prob_j).
+      grad_distances[n][yi][xi][k] = (-1.0 / sigma) * prob *
+          (grad_alpha * alpha + grad_weight * exp_z * (1.0 - prob));
+
+      scalar_t grad_z_inv = grad_weight * weight / gamma;
+      if (k == k_max) {
+        grad_z_inv += grad_zmax;
+      }
+      grad_zbuf[n][yi][xi][k] = -grad_z_inv / (zfar - znear);
+    }
+  }
+}
+
+std::tuple<at::Tensor, at::Tensor, at::Tensor> SoftmaxRGBBlendBackwardCuda(
+    const at::Tensor& grad_pixel_colors, // (N, H, W, 4)
+    const at::Tensor& pixel_colors, // (N, H, W, 4)
+    const at::Tensor& z_inv_max, // (N, H, W)
+    const at::Tensor& denom, // (N, H, W)
+    const at::Tensor& colors, // (N, H, W, K, 3)
+    const at::Tensor& distances, // (N, H, W, K)
+    const at::Tensor& zbuf, // (N, H, W, K)
+    const at::Tensor& pix_to_face, // (N, H, W, K)
+    const at::Tensor& background, // (3)
+    const double sigma,
+    const double gamma,
+    const double znear,
+    const double zfar) {
+  const int N = pix_to_face.size(0);
+  const int H = pix_to_face.size(1);
+  const int W = pix_to_face.size(2);
+  const int K = pix_to_face.size(3);
+
+  at::Tensor grad_colors = at::zeros({N, H, W, K, 3}, colors.options());
+  at::Tensor grad_distances = at::zeros({N, H, W, K}, distances.options());
+  at::Tensor grad_zbuf = at::zeros({N, H, W, K}, zbuf.options());
+  const size_t blocks = 1024;
+  const size_t threads = 128;
+
+  at::TensorArg grad_pixel_colors_t{grad_pixel_colors, "grad_pixel_colors", 1},
+      pixel_colors_t{pixel_colors, "pixel_colors", 2},
+      z_inv_max_t{z_inv_max, "z_inv_max", 3}, denom_t{denom, "denom", 4},
+      colors_t{colors, "colors", 5}, distances_t{distances, "distances", 6},
+      zbuf_t{zbuf, "zbuf", 7}, pix_to_face_t{pix_to_face, "pix_to_face", 8},
+      background_t{background, "background", 9};
+  at::CheckedFrom c = "SoftmaxRGBBlendBackwardCuda";
+  at::checkAllSameGPU(
+      c,
+      {grad_pixel_colors_t,
+       pixel_colors_t,
+       z_inv_max_t,
+       denom_t,
+       colors_t,
+       distances_t,
+       zbuf_t,
+       pix_to_face_t,
+       background_t});
+
+  // Set the device for the kernel launch based on the device of colors
+  at::cuda::CUDAGuard device_guard(colors.device());
+  cudaStream_t stream = at::cuda::getCurrentCUDAStream();
+
+  if (pix_to_face.numel() == 0) {
+    AT_CUDA_CHECK(cudaGetLastError());
+    return std::make_tuple(grad_colors, grad_distances, grad_zbuf);
+  }
+
+  AT_DISPATCH_FLOATING_TYPES(
+      colors.scalar_type(), "softmax_rgb_blend_backward_kernel", ([&] {
+        SoftmaxRGBBlendBackwardKernel<scalar_t>
+            <<<blocks, threads, 0, stream>>>(
+                // clang-format off
+            grad_pixel_colors.packed_accessor<scalar_t, 4, torch::RestrictPtrTraits, size_t>(),
+            pixel_colors.packed_accessor<scalar_t, 4, torch::RestrictPtrTraits, size_t>(),
+            z_inv_max.packed_accessor<scalar_t, 3, torch::RestrictPtrTraits, size_t>(),
+            denom.packed_accessor<scalar_t, 3, torch::RestrictPtrTraits, size_t>(),
+            colors.packed_accessor<scalar_t, 5, torch::RestrictPtrTraits, size_t>(),
+            distances.packed_accessor<scalar_t, 4, torch::RestrictPtrTraits, size_t>(),
+            zbuf.packed_accessor<scalar_t, 4, torch::RestrictPtrTraits, size_t>(),
+            pix_to_face.packed_accessor<int64_t, 4, torch::RestrictPtrTraits, size_t>(),
+            background.packed_accessor<scalar_t, 1, torch::RestrictPtrTraits, size_t>(),
+            grad_colors.packed_accessor<scalar_t, 5, torch::RestrictPtrTraits, size_t>(),
+            grad_distances.packed_accessor<scalar_t, 4, torch::RestrictPtrTraits, size_t>(),
+            grad_zbuf.packed_accessor<scalar_t, 4, torch::RestrictPtrTraits, size_t>(),
+                // clang-format on
+                sigma,
+                gamma,
+                znear,
+                zfar,
+                N,
+                H,
+                W,
+                K);
+      }));
+
+  AT_CUDA_CHECK(cudaGetLastError());
+  return std::make_tuple(grad_colors, grad_distances, grad_zbuf);
+}
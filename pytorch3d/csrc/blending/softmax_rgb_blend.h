@@ -0,0 +1,199 @@
+// Copyright (c) Facebook, Inc. and its affiliates. All rights reserved.
+
+#pragma once
+#include <torch/extension.h>
+#include <tuple>
+
+// clang-format off
+// Function to blend the colors of the top K faces per pixel using the 2d
+// distance based probability map and the relative z distances as proposed in [1].
+// Each pixel is processed by one thread looping over K so that the (N, H, W, K)
+// intermediates of the PyTorch implementation are never materialized.
+// Args:
+//      colors: FloatTensor of shape (N, H, W, K, 3), RGB color for each of the
+//          top K faces per pixel.
+//      distances: FloatTensor of shape (N, H, W, K), 2d euclidean distance of each
+//          pixel relative to the faces in pix_to_face
+//      zbuf: FloatTensor of shape (N, H, W, K), depth of each of the top K faces
+//          at each pixel
+//      pix_to_face: LongTensor of shape (N, H, W, K), indices of faces overlapping
+//          with each pixel, where N is the batch size, H, W are the dimensions of the
+//          image and K is the number of faces rasterized per pixel.
+//      background: FloatTensor of shape (3), RGB background color
+//      sigma: float, parameter which controls the width of the sigmoid for blending
+//      gamma: float, parameter which controls the scaling of the exponential
+//          used for the z based weights
+//      znear: float, near clipping plane in the z direction
+//      zfar: float, far clipping plane in the z direction
+// Returns:
+//      pixel_colors: FloatTensor of shape (N, H, W, 4), the blended RGBA image.
+//      z_inv_max: FloatTensor of shape (N, H, W), the clamped max of the inverse
+//          depth over K, used to stabilize the exponential.
+//      denom: FloatTensor of shape (N, H, W), the normalization term of the
+//          softmax weights (including the background weight).
+//
+// [1] Shichen Liu et al, 'Soft Rasterizer: A Differentiable Renderer for
+// Image-based 3D Reasoning'
+// clang-format on
+std::tuple<at::Tensor, at::Tensor, at::Tensor> SoftmaxRGBBlendForwardCpu(
+    const at::Tensor& colors,
+    const at::Tensor& distances,
+    const at::Tensor& zbuf,
+    const at::Tensor& pix_to_face,
+    const at::Tensor& background,
+    const double sigma,
+    const double gamma,
+    const double znear,
+    const double zfar);
+
+#ifdef WITH_CUDA
+std::tuple<at::Tensor, at::Tensor, at::Tensor> SoftmaxRGBBlendForwardCuda(
+    const at::Tensor& colors,
+    const at::Tensor& distances,
+    const at::Tensor& zbuf,
+    const at::Tensor& pix_to_face,
+    const at::Tensor& background,
+    const double sigma,
+    const double gamma,
+    const double znear,
+    const double zfar);
+#endif
+
+// clang-format off
+// Args:
+//      grad_pixel_colors: FloatTensor of shape (N, H, W, 4), upstream gradients
+//          for the RGBA image
+//      pixel_colors: FloatTensor of shape (N, H, W, 4), the output of the forward pass
+//      z_inv_max: FloatTensor of shape (N, H, W), from the forward pass
+//      denom: FloatTensor of shape (N, H, W), from the forward pass
+//      colors, distances, zbuf, pix_to_face, background, sigma, gamma, znear, zfar:
+//          the same inputs as for the forward pass
+// Returns:
+//      grad_colors: FloatTensor of shape (N, H, W, K, 3)
+//      grad_distances: FloatTensor of shape (N, H, W, K)
+//      grad_zbuf: FloatTensor of shape (N, H, W, K)
+// clang-format on
+std::tuple<at::Tensor, at::Tensor, at::Tensor> SoftmaxRGBBlendBackwardCpu(
+    const at::Tensor& grad_pixel_colors,
+    const at::Tensor& pixel_colors,
+    const at::Tensor& z_inv_max,
+    const at::Tensor& denom,
+    const at::Tensor& colors,
+    const at::Tensor& distances,
+    const at::Tensor& zbuf,
+    const at::Tensor& pix_to_face,
+    const at::Tensor& background,
+    const double sigma,
+    const double gamma,
+    const double znear,
+    const double zfar);
+
+#ifdef WITH_CUDA
+std::tuple<at::Tensor, at::Tensor, at::Tensor> SoftmaxRGBBlendBackwardCuda(
+    const at::Tensor& grad_pixel_colors,
+    const at::Tensor& pixel_colors,
+    const at::Tensor& z_inv_max,
+    const at::Tensor& denom,
+    const at::Tensor& colors,
+    const at::Tensor& distances,
+    const at::Tensor& zbuf,
+    const at::Tensor& pix_to_face,
+    const at::Tensor& background,
+    const double sigma,
+    const double gamma,
+    const double znear,
+    const double zfar);
+#endif
+
+// Implementation which is exposed.
+std::tuple<at::Tensor, at::Tensor, at::Tensor> SoftmaxRGBBlend(
+    const at::Tensor& colors,
+    const at::Tensor& distances,
+    const at::Tensor& zbuf,
+    const at::Tensor& pix_to_face,
+    const at::Tensor& background,
+    const double sigma,
+    const double gamma,
+    const double znear,
+    const double zfar) {
+  if (colors.is_cuda() && distances.is_cuda() && zbuf.is_cuda() &&
+      pix_to_face.is_cuda() && background.is_cuda()) {
+#ifdef WITH_CUDA
+    return SoftmaxRGBBlendForwardCuda(
+        colors,
+        distances,
+        zbuf,
+        pix_to_face,
+        background,
+        sigma,
+        gamma,
+        znear,
+        zfar);
+#else
+    AT_ERROR("Not compiled with GPU support.");
+#endif
+  }
+  return SoftmaxRGBBlendForwardCpu(
+      colors,
+      distances,
+      zbuf,
+      pix_to_face,
+      background,
+      sigma,
+      gamma,
+      znear,
+      zfar);
+}
+
+// Implementation which is exposed.
+std::tuple<at::Tensor, at::Tensor, at::Tensor> SoftmaxRGBBlendBackward(
+    const at::Tensor& grad_pixel_colors,
+    const at::Tensor& pixel_colors,
+    const at::Tensor& z_inv_max,
+    const at::Tensor& denom,
+    const at::Tensor& colors,
+    const at::Tensor& distances,
+    const at::Tensor& zbuf,
+    const at::Tensor& pix_to_face,
+    const at::Tensor& background,
+    const double sigma,
+    const double gamma,
+    const double znear,
+    const double zfar) {
+  if (grad_pixel_colors.is_cuda() && pixel_colors.is_cuda() &&
+      colors.is_cuda() && distances.is_cuda() && zbuf.is_cuda() &&
+      pix_to_face.is_cuda() && background.is_cuda()) {
+#ifdef WITH_CUDA
+    return SoftmaxRGBBlendBackwardCuda(
+        grad_pixel_colors,
+        pixel_colors,
+        z_inv_max,
+        denom,
+        colors,
+        distances,
+        zbuf,
+        pix_to_face,
+        background,
+        sigma,
+        gamma,
+        znear,
+        zfar);
+#else
+    AT_ERROR("Not compiled with GPU support.");
+#endif
+  }
+  return SoftmaxRGBBlendBackwardCpu(
+      grad_pixel_colors,
+      pixel_colors,
+      z_inv_max,
+      denom,
+      colors,
+      distances,
+      zbuf,
+      pix_to_face,
+      background,
+      sigma,
+      gamma,
+      znear,
+      zfar);
+}
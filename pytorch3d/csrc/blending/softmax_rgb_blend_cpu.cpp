@@ -0,0 +1,310 @@
+// Copyright (c) Facebook, Inc. and its affiliates. All rights reserved.
+
+#include <torch/extension.h>
+#include <cmath>
+#include <tuple>
+
+// Weight for the background color and minimum value of z_inv_max.
+// This must match the value used in the PyTorch implementation.
+#define SOFTMAX_BLEND_EPS 1e-10
+
+template <typename scalar_t>
+void SoftmaxRGBBlendForwardCpuImpl(
+    const at::Tensor& colors, // (N, H, W, K, 3)
+    const at::Tensor& distances, // (N, H, W, K)
+    const at::Tensor& zbuf, // (N, H, W, K)
+    const at::Tensor& pix_to_face, // (N, H, W, K)
+    const at::Tensor& background, // (3)
+    at::Tensor& pixel_colors, // (N, H, W, 4)
+    at::Tensor& z_inv_max, // (N, H, W)
+    at::Tensor& denoms, // (N, H, W)
+    const scalar_t sigma,
+    const scalar_t gamma,
+    const scalar_t znear,
+    const scalar_t zfar) {
+  const int N = pix_to_face.size(0);
+  const int H = pix_to_face.size(1);
+  const int W = pix_to_face.size(2);
+  const int K = pix_to_face.size(3);
+  const scalar_t eps = SOFTMAX_BLEND_EPS;
+
+  auto colors_a = colors.accessor<scalar_t, 5>();
+  auto distances_a = distances.accessor<scalar_t, 4>();
+  auto zbuf_a = zbuf.accessor<scalar_t, 4>();
+  auto pix_to_face_a = pix_to_face.accessor<int64_t, 4>();
+  auto background_a = background.accessor<scalar_t, 1>();
+  auto pixel_colors_a = pixel_colors.accessor<scalar_t, 4>();
+  auto z_inv_max_a = z_inv_max.accessor<scalar_t, 3>();
+  auto denoms_a = denoms.accessor<scalar_t, 3>();
+
+  // Iterate over the images in the batch.
+  for (int n = 0; n < N; ++n) {
+    // Iterate through the horizontal lines of the image from top to bottom.
+    for (int h = 0; h < H; ++h) {
+      // Iterate over the pixels on this horizontal line, left to right.
+      for (int w = 0; w < W; ++w) {
+        // Find the max inverse depth to stabilize the exponential. Padded
+        // faces have z_inv = 0, so starting from eps gives the same result
+        // as the clamp in the PyTorch version.
+        scalar_t zmax = eps;
+        for (int k = 0; k < K; ++k) {
+          if (pix_to_face_a[n][h][w][k] < 0) {
+            // Sentinel value is -1 indicating no face overlaps the pixel.
+            continue;
+          }
+          const scalar_t z_inv = (zfar - zbuf_a[n][h][w][k]) / (zfar - znear);
+          zmax = z_inv > zmax ? z_inv : zmax;
+        }
+
+        scalar_t alpha = 1.0;
+        scalar_t denom = 0.0;
+        scalar_t rgb[3] = {0.0, 0.0, 0.0};
+        for (int k = 0; k < K; ++k) {
+          if (pix_to_face_a[n][h][w][k] < 0) {
+            continue;
+          }
+          // The distance is negative if a pixel is inside a face and positive
+          // outside the face, so prob = sigmoid(-dist / sigma).
+          const scalar_t prob =
+              1. / (1. + exp(distances_a[n][h][w][k] / sigma));
+          alpha *= 1.0 - prob;
+          const scalar_t z_inv = (zfar - zbuf_a[n][h][w][k]) / (zfar - znear);
+          const scalar_t weight = prob * exp((z_inv - zmax) / gamma);
+          denom += weight;
+          for (int c = 0; c < 3; ++c) {
+            rgb[c] += weight * colors_a[n][h][w][k][c];
+          }
+        }
+
+        // Exp normalize trick for the background color weight.
+        // Clamp to ensure delta is never 0.
+        scalar_t delta = exp((eps - zmax) / gamma);
+        delta = delta < eps ? eps : delta;
+        denom += delta;
+
+        for (int c = 0; c < 3; ++c) {
+          pixel_colors_a[n][h][w][c] =
+              (rgb[c] + delta * background_a[c]) / denom;
+        }
+        pixel_colors_a[n][h][w][3] = 1.0 - alpha;
+        z_inv_max_a[n][h][w] = zmax;
+        denoms_a[n][h][w] = denom;
+      }
+    }
+  }
+}
+
+std::tuple<at::Tensor, at::Tensor, at::Tensor> SoftmaxRGBBlendForwardCpu(
+    const at::Tensor& colors, // (N, H, W, K, 3)
+    const at::Tensor& distances, // (N, H, W, K)
+    const at::Tensor& zbuf, // (N, H, W, K)
+    const at::Tensor& pix_to_face, // (N, H, W, K)
+    const at::Tensor& background, // (3)
+    const double sigma,
+    const double gamma,
+    const double znear,
+    const double zfar) {
+  const int N = pix_to_face.size(0);
+  const int H = pix_to_face.size(1);
+  const int W = pix_to_face.size(2);
+
+  at::Tensor pixel_colors = at::zeros({N, H, W, 4}, colors.options());
+  at::Tensor z_inv_max = at::zeros({N, H, W}, colors.options());
+  at::Tensor denom = at::zeros({N, H, W}, colors.options());
+
+  AT_DISPATCH_FLOATING_TYPES(
+      colors.scalar_type(), "softmax_rgb_blend_cpu", ([&] {
+        SoftmaxRGBBlendForwardCpuImpl<scalar_t>(
+            colors,
+            distances,
+            zbuf,
+            pix_to_face,
+            background,
+            pixel_colors,
+            z_inv_max,
+            denom,
+            sigma,
+            gamma,
+            znear,
+            zfar);
+      }));
+  return std::make_tuple(pixel_colors, z_inv_max, denom);
+}
+
+template <typename scalar_t>
+void SoftmaxRGBBlendBackwardCpuImpl(
+    const at::Tensor& grad_pixel_colors, // (N, H, W, 4)
+    const at::Tensor& pixel_colors, // (N, H, W, 4)
+    const at::Tensor& z_inv_max, // (N, H, W)
+    const at::Tensor& denoms, // (N, H, W)
+    const at::Tensor& colors, // (N, H, W, K, 3)
+    const at::Tensor& distances, // (N, H, W, K)
+    const at::Tensor& zbuf, // (N, H, W, K)
+    const at::Tensor& pix_to_face, // (N, H, W, K)
+    const at::Tensor& background, // (3)
+    at::Tensor& grad_colors, // (N, H, W, K, 3)
+    at::Tensor& grad_distances, // (N, H, W, K)
+    at::Tensor& grad_zbuf, // (N, H, W, K)
+    const scalar_t sigma,
+    const scalar_t gamma,
+    const scalar_t znear,
+    const scalar_t zfar) {
+  const int N = pix_to_face.size(0);
+  const int H = pix_to_face.size(1);
+  const int W = pix_to_face.size(2);
+  const int K = pix_to_face.size(3);
+  const scalar_t eps = SOFTMAX_BLEND_EPS;
+
+  auto grad_pixel_colors_a = grad_pixel_colors.accessor<scalar_t, 4>();
+  auto pixel_colors_a = pixel_colors.accessor<scalar_t, 4>();
+  auto z_inv_max_a = z_inv_max.accessor<scalar_t, 3>();
+  auto denoms_a = denoms.accessor<scalar_t, 3>();
+  auto colors_a = colors.accessor<scalar_t, 5>();
+  auto distances_a = distances.accessor<scalar_t, 4>();
+  auto zbuf_a = zbuf.accessor<scalar_t, 4>();
+  auto pix_to_face_a = pix_to_face.accessor<int64_t, 4>();
+  auto background_a = background.accessor<scalar_t, 1>();
+  auto grad_colors_a = grad_colors.accessor<scalar_t, 5>();
+  auto grad_distances_a = grad_distances.accessor<scalar_t, 4>();
+  auto grad_zbuf_a = grad_zbuf.accessor<scalar_t, 4>();
+
+  // Iterate over the images in the batch.
+  for (int n = 0; n < N; ++n) {
+    // Iterate through the horizontal lines of the image from top to bottom.
+    for (int h = 0; h < H; ++h) {
+      // Iterate over the pixels on this horizontal line, left to right.
+      for (int w = 0; w < W; ++w) {
+        const scalar_t zmax = z_inv_max_a[n][h][w];
+        const scalar_t denom = denoms_a[n][h][w];
+        // 1.0 - alpha is the product of (1.0 - prob) over K.
+        const scalar_t alpha = 1.0 - pixel_colors_a[n][h][w][3];
+        const scalar_t grad_alpha = grad_pixel_colors_a[n][h][w][3];
+        // dot(grad_rgb, rgb) is shared by the gradient of every weight.
+        scalar_t grad_dot_rgb = 0.0;
+        for (int c = 0; c < 3; ++c) {
+          grad_dot_rgb +=
+              grad_pixel_colors_a[n][h][w][c] * pixel_colors_a[n][h][w][c];
+        }
+
+        // Gradient flowing into z_inv_max through the weights, and the
+        // face which attains the max.
+        scalar_t grad_zmax = 0.0;
+        scalar_t z_best = eps;
+        int k_max = -1;
+        for (int k = 0; k < K; ++k) {
+          if (pix_to_face_a[n][h][w][k] < 0) {
+            continue;
+          }
+          const scalar_t prob =
+              1. / (1. + exp(distances_a[n][h][w][k] / sigma));
+          const scalar_t z_inv = (zfar - zbuf_a[n][h][w][k]) / (zfar - znear);
+          const scalar_t weight = prob * exp((z_inv - zmax) / gamma);
+          // d_rgb / d_weight = (color - rgb) / denom
+          scalar_t grad_weight = -grad_dot_rgb;
+          for (int c = 0; c < 3; ++c) {
+            grad_weight +=
+                grad_pixel_colors_a[n][h][w][c] * colors_a[n][h][w][k][c];
+          }
+          grad_weight /= denom;
+          grad_zmax -= grad_weight * weight / gamma;
+          if (z_inv > z_best) {
+            z_best = z_inv;
+            k_max = k;
+          }
+        }
+
+        // The background weight only depends on z_inv_max if it is not
+        // clamped.
+        const scalar_t delta = exp((eps - zmax) / gamma);
+        if (delta >= eps) {
+          // d_rgb / d_delta = (background - rgb) / denom
+          scalar_t grad_delta = -grad_dot_rgb;
+          for (int c = 0; c < 3; ++c) {
+            grad_delta += grad_pixel_colors_a[n][h][w][c] * background_a[c];
+          }
+          grad_delta /= denom;
+          grad_zmax -= grad_delta * delta / gamma;
+        }
+
+        for (int k = 0; k < K; ++k) {
+          if (pix_to_face_a[n][h][w][k] < 0) {
+            continue;
+          }
+          const scalar_t prob =
+              1. / (1. + exp(distances_a[n][h][w][k] / sigma));
+          const scalar_t z_inv = (zfar - zbuf_a[n][h][w][k]) / (zfar - znear);
+          const scalar_t exp_z = exp((z_inv - zmax) / gamma);
+          const scalar_t weight = prob * exp_z;
+          scalar_t grad_weight = -grad_dot_rgb;
+          for (int c = 0; c < 3; ++c) {
+            grad_weight +=
+                grad_pixel_colors_a[n][h][w][c] * colors_a[n][h][w][k][c];
+            grad_colors_a[n][h][w][k][c] =
+                grad_pixel_colors_a[n][h][w][c] * weight / denom;
+          }
+          grad_weight /= denom;
+
+          // clang-format off
+          // d_prob / d_dist = (-1.0 / sigma) * prob * (1.0 - prob)
+          // d_alpha / d_prob = prod_{j != k} (1.0 - prob_j)
+          // => d_alpha / d_dist = (-1.0 / sigma) * prob * prod_j (1.0 - prob_j)
+          // clang-format on
+          grad_distances_a[n][h][w][k] = (-1.0 / sigma) * prob *
+              (grad_alpha * alpha + grad_weight * exp_z * (1.0 - prob));
+
+          scalar_t grad_z_inv = grad_weight * weight / gamma;
+          if (k == k_max) {
+            grad_z_inv += grad_zmax;
+          }
+          grad_zbuf_a[n][h][w][k] = -grad_z_inv / (zfar - znear);
+        }
+      }
+    }
+  }
+}
+
+std::tuple<at::Tensor, at::Tensor, at::Tensor> SoftmaxRGBBlendBackwardCpu(
+    const at::Tensor& grad_pixel_colors, // (N, H, W, 4)
+    const at::Tensor& pixel_colors, // (N, H, W, 4)
+    const at::Tensor& z_inv_max, // (N, H, W)
+    const at::Tensor& denom, // (N, H, W)
+    const at::Tensor& colors, // (N, H, W, K, 3)
+    const at::Tensor& distances, // (N, H, W, K)
+    const at::Tensor& zbuf, // (N, H, W, K)
+    const at::Tensor& pix_to_face, // (N, H, W, K)
+    const at::Tensor& background, // (3)
+    const double sigma,
+    const double gamma,
+    const double znear,
+    const double zfar) {
+  const int N = pix_to_face.size(0);
+  const int H = pix_to_face.size(1);
+  const int W = pix_to_face.size(2);
+  const int K = pix_to_face.size(3);
+
+  at::Tensor grad_colors = at::zeros({N, H, W, K, 3}, colors.options());
+  at::Tensor grad_distances = at::zeros({N, H, W, K}, distances.options());
+  at::Tensor grad_zbuf = at::zeros({N, H, W, K}, zbuf.options());
+
+  AT_DISPATCH_FLOATING_TYPES(
+      colors.scalar_type(), "softmax_rgb_blend_backward_cpu", ([&] {
+        SoftmaxRGBBlendBackwardCpuImpl<scalar_t>(
+            grad_pixel_colors,
+            pixel_colors,
+            z_inv_max,
+            denom,
+            colors,
+            distances,
+            zbuf,
+            pix_to_face,
+            background,
+            grad_colors,
+            grad_distances,
+            grad_zbuf,
+            sigma,
+            gamma,
+            znear,
+            zfar);
+      }));
+  return std::make_tuple(grad_colors, grad_distances, grad_zbuf);
+}
@@ -20,7 +20,8 @@ __global__ void alphaCompositeCudaForwardKernel(
     at::PackedTensorAccessor64<float, 4, at::RestrictPtrTraits> result,
     const at::PackedTensorAccessor64<float, 2, at::RestrictPtrTraits> features,
     const at::PackedTensorAccessor64<float, 4, at::RestrictPtrTraits> alphas,
-    const at::PackedTensorAccessor64<int64_t, 4, at::RestrictPtrTraits> points_idx) {
+    const at::PackedTensorAccessor64<int64_t, 4, at::RestrictPtrTraits> points_idx,
+    const at::PackedTensorAccessor64<float, 1, at::RestrictPtrTraits> background_color) {
   // clang-format on
   const int64_t batch_size = result.size(0);
   const int64_t C = features.size(0);
@@ -40,6 +41,13 @@ __global__ void alphaCompositeCudaForwardKernel(
     int j = (pid % (W * H)) / H;
     int i = (pid % (W * H)) % H;
 
+    // Pixels which are not covered by any point are set to the background
+    // color directly instead of being written in a second pass.
+    if (background_color.size(0) > 0 && points_idx[batch][0][j][i] < 0) {
+      result[batch][ch][j][i] = background_color[ch];
+      continue;
+    }
+
     // alphacomposite the different values
     float cum_alpha = 1.;
     // Iterate through the closest K points for this pixel
@@ -139,13 +147,16 @@ __global__ void alphaCompositeCudaBackwardKernel(
 at::Tensor alphaCompositeCudaForward(
     const at::Tensor& features,
     const at::Tensor& alphas,
-    const at::Tensor& points_idx) {
+    const at::Tensor& points_idx,
+    const at::Tensor& background_color) {
   // Check inputs are on the same device
   at::TensorArg features_t{features, "features", 1},
-      alphas_t{alphas, "alphas", 2}, points_idx_t{points_idx, "points_idx", 3};
+      alphas_t{alphas, "alphas", 2}, points_idx_t{points_idx, "points_idx", 3},
+      background_color_t{background_color, "background_color", 4};
   at::CheckedFrom c = "alphaCompositeCudaForward";
-  at::checkAllSameGPU(c, {features_t, alphas_t, points_idx_t});
-  at::checkAllSameType(c, {features_t, alphas_t});
+  at::checkAllSameGPU(
+      c, {features_t, alphas_t, points_idx_t, background_color_t});
+  at::checkAllSameType(c, {features_t, alphas_t, background_color_t});
 
   // Set the device for the kernel launch based on the device of the input
   at::cuda::CUDAGuard device_guard(features.device());
@@ -175,7 +186,8 @@ at::Tensor alphaCompositeCudaForward(
       result.packed_accessor64<float, 4, at::RestrictPtrTraits>(),
       features.packed_accessor64<float, 2, at::RestrictPtrTraits>(),
       alphas.packed_accessor64<float, 4, at::RestrictPtrTraits>(),
-      points_idx.packed_accessor64<int64_t, 4, at::RestrictPtrTraits>());
+      points_idx.packed_accessor64<int64_t, 4, at::RestrictPtrTraits>(),
+      background_color.packed_accessor64<float, 1, at::RestrictPtrTraits>());
   // clang-format on
   AT_CUDA_CHECK(cudaGetLastError());
   return result;
@@ -11,7 +11,8 @@ const float kEps = 1e-9;
 torch::Tensor alphaCompositeCpuForward(
     const torch::Tensor& features,
     const torch::Tensor& alphas,
-    const torch::Tensor& points_idx) {
+    const torch::Tensor& points_idx,
+    const torch::Tensor& background_color) {
   const int64_t B = points_idx.size(0);
   const int64_t K = points_idx.size(1);
   const int64_t H = points_idx.size(2);
@@ -24,6 +25,8 @@ torch::Tensor alphaCompositeCpuForward(
   auto alphas_a = alphas.accessor<float, 4>();
   auto points_idx_a = points_idx.accessor<int64_t, 4>();
   auto result_a = result.accessor<float, 4>();
+  auto background_color_a = background_color.accessor<float, 1>();
+  const bool has_background = background_color.numel() > 0;
 
   // Iterate over the batch
   for (int b = 0; b < B; ++b) {
@@ -33,6 +36,12 @@ torch::Tensor alphaCompositeCpuForward(
       for (int j = 0; j < H; ++j) {
         // Iterate over pixels in a horizontal line, left to right
         for (int i = 0; i < W; ++i) {
+          // Pixels which are not covered by any point are set to the
+          // background color directly.
+          if (has_background && points_idx_a[b][0][j][i] < 0) {
+            result_a[b][c][j][i] = background_color_a[c];
+            continue;
+          }
           float cum_alpha = 1.;
           // Iterate through the closest K points for this pixel
           for (int k = 0; k < K; ++k) {
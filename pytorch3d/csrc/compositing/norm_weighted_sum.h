@@ -16,6 +16,9 @@
 //            sorted in z-order, and W is the image size.
 //    points_idx: IntTensor of shape (N, points_per_pixel, W, W) giving the
 //            indices of the nearest points at each pixel, sorted in z-order.
+//    background_color: FloatTensor of shape (C) or empty. If not empty,
+//            pixels with no nearest point (points_idx[b,0,i,j] < 0) are set
+//            to background_color instead of being composited.
 // Returns:
 //    weighted_fs: FloatTensor of shape (N, C, W, W) giving the accumulated
 //            feature in each point. Concretely, it gives:
@@ -27,7 +30,8 @@
 torch::Tensor weightedSumNormCudaForward(
     const torch::Tensor& features,
     const torch::Tensor& alphas,
-    const torch::Tensor& points_idx);
+    const torch::Tensor& points_idx,
+    const torch::Tensor& background_color);
 
 std::tuple<torch::Tensor, torch::Tensor> weightedSumNormCudaBackward(
     const torch::Tensor& grad_outputs,
@@ -40,7 +44,8 @@ std::tuple<torch::Tensor, torch::Tensor> weightedSumNormCudaBackward(
 torch::Tensor weightedSumNormCpuForward(
     const torch::Tensor& features,
     const torch::Tensor& alphas,
-    const torch::Tensor& points_idx);
+    const torch::Tensor& points_idx,
+    const torch::Tensor& background_color);
 
 std::tuple<torch::Tensor, torch::Tensor> weightedSumNormCpuBackward(
     const torch::Tensor& grad_outputs,
@@ -51,23 +56,32 @@ std::tuple<torch::Tensor, torch::Tensor> weightedSumNormCpuBackward(
 torch::Tensor weightedSumNormForward(
     torch::Tensor& features,
     torch::Tensor& alphas,
-    torch::Tensor& points_idx) {
+    torch::Tensor& points_idx,
+    torch::Tensor& background_color) {
   features = features.contiguous();
   alphas = alphas.contiguous();
   points_idx = points_idx.contiguous();
+  background_color = background_color.contiguous();
+  TORCH_CHECK(
+      background_color.numel() == 0 ||
+          background_color.numel() == features.size(0),
+      "background_color must be empty or have one value per feature channel");
 
   if (features.is_cuda()) {
 #ifdef WITH_CUDA
     CHECK_CUDA(features);
     CHECK_CUDA(alphas);
     CHECK_CUDA(points_idx);
+    CHECK_CUDA(background_color);
 
-    return weightedSumNormCudaForward(features, alphas, points_idx);
+    return weightedSumNormCudaForward(
+        features, alphas, points_idx, background_color);
 #else
     AT_ERROR("Not compiled with GPU support");
 #endif
   } else {
-    return weightedSumNormCpuForward(features, alphas, points_idx);
+    return weightedSumNormCpuForward(
+        features, alphas, points_idx, background_color);
   }
 }
 
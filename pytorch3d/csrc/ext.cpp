@@ -7,6 +7,7 @@
 #include "./pulsar/pytorch/renderer.h"
 #include "./pulsar/pytorch/tensor_util.h"
 #include "blending/sigmoid_alpha_blend.h"
+#include "blending/softmax_rgb_blend.h"
 #include "compositing/alpha_composite.h"
 #include "compositing/norm_weighted_sum.h"
 #include "compositing/weighted_sum.h"
@@ -38,6 +39,8 @@ PYBIND11_MODULE(TORCH_EXTENSION_NAME, m) {
   m.def("rasterize_meshes", &RasterizeMeshes);
   m.def("sigmoid_alpha_blend", &SigmoidAlphaBlend);
   m.def("sigmoid_alpha_blend_backward", &SigmoidAlphaBlendBackward);
+  m.def("softmax_rgb_blend", &SoftmaxRGBBlend);
+  m.def("softmax_rgb_blend_backward", &SoftmaxRGBBlendBackward);
 
   // Accumulation functions
   m.def("accum_weightedsumnorm", &weightedSumNormForward);
@@ -1,7 +1,9 @@
 # Copyright (c) Facebook, Inc. and its affiliates. All rights reserved.
 
 
-from typing import NamedTuple, Sequence
+import functools
+import math
+from typing import NamedTuple, Optional, Sequence
 
 import torch
 
@@ -19,6 +21,9 @@ class BlendParams(NamedTuple):
     sigma: float = 1e-4
     gamma: float = 1e-4
     background_color: Sequence = (1.0, 1.0, 1.0)
+    # Optional reduced precision dtype (e.g. torch.float16) for the colors in
+    # softmax_rgb_blend. None keeps the dtype of the inputs.
+    dtype: Optional[torch.dtype] = None
 
 
 def hard_rgb_blend(colors, fragments, blend_params) -> torch.Tensor:
@@ -30,8 +35,8 @@ def hard_rgb_blend(colors, fragments, blend_params) -> torch.Tensor:
     Args:
         colors: (N, H, W, K, 3) RGB color for each of the top K faces per pixel.
         fragments: the outputs of rasterization. From this we use
-            - pix_to_face: LongTensor of shape (N, H, W, K) specifying the indices
-              of the faces (in the packed representation) which
+            - pix_to_face: LongTensor or IntTensor of shape (N, H, W, K) specifying
+              the indices of the faces (in the packed representation) which
               overlap each pixel in the image. This is used to
               determine the output shape.
         blend_params: BlendParams instance that contains a background_color
@@ -43,20 +48,15 @@ def hard_rgb_blend(colors, fragments, blend_params) -> torch.Tensor:
     device = fragments.pix_to_face.device
 
     # Mask for the background.
-    is_background = fragments.pix_to_face[..., 0] < 0  # (N, H, W)
+    is_background = ~_valid_mask(fragments)[..., 0]  # (N, H, W)
 
-    if torch.is_tensor(blend_params.background_color):
-        background_color = blend_params.background_color.to(device)
-    else:
-        background_color = colors.new_tensor(blend_params.background_color)  # (3)
-
-    # Find out how much background_color needs to be expanded to be used for masked_scatter.
-    num_background_pixels = is_background.sum()
+    background_color = _background_color_tensor(blend_params, colors)  # (3)
 
     # Set background color.
-    pixel_colors = colors[..., 0, :].masked_scatter(
+    pixel_colors = torch.where(
         is_background[..., None],
-        background_color[None, :].expand(num_background_pixels, -1),
+        background_color.view(1, 1, 1, 3),
+        colors[..., 0, :],
     )  # (N, H, W, 3)
 
     # Concat with the alpha channel.
@@ -68,6 +68,7 @@ def hard_rgb_blend(colors, fragments, blend_params) -> torch.Tensor:
 class _SigmoidAlphaBlend(torch.autograd.Function):
     @staticmethod
     def forward(ctx, dists, pix_to_face, sigma):
+        pix_to_face = _int64_pix_to_face(pix_to_face)
         alphas = _C.sigmoid_alpha_blend(dists, pix_to_face, sigma)
         ctx.save_for_backward(dists, pix_to_face, alphas)
         ctx.sigma = sigma
@@ -96,8 +97,8 @@ def sigmoid_alpha_blend(colors, fragments, blend_params) -> torch.Tensor:
     Args:
         colors: (N, H, W, K, 3) RGB color for each of the top K faces per pixel.
         fragments: the outputs of rasterization. From this we use
-            - pix_to_face: LongTensor of shape (N, H, W, K) specifying the indices
-              of the faces (in the packed representation) which
+            - pix_to_face: LongTensor or IntTensor of shape (N, H, W, K) specifying
+              the indices of the faces (in the packed representation) which
               overlap each pixel in the image.
             - dists: FloatTensor of shape (N, H, W, K) specifying
               the 2D euclidean distance from the center of each pixel
@@ -109,12 +110,92 @@ def sigmoid_alpha_blend(colors, fragments, blend_params) -> torch.Tensor:
     [1] Liu et al, 'Soft Rasterizer: A Differentiable Renderer for Image-based
         3D Reasoning', ICCV 2019
     """
-    N, H, W, K = fragments.pix_to_face.shape
-    pixel_colors = torch.ones((N, H, W, 4), dtype=colors.dtype, device=colors.device)
-    pixel_colors[..., :3] = colors[..., 0, :]
-    alpha = _sigmoid_alpha(fragments.dists, fragments.pix_to_face, blend_params.sigma)
-    pixel_colors[..., 3] = alpha
-    return pixel_colors
+    rgb = colors[..., 0, :]  # (N, H, W, 3)
+    if blend_params.sigma == 0:
+        # In the limit sigma -> 0 the probability map is 1 for faces which
+        # contain the pixel center (dists < 0) and 0 otherwise, including faces
+        # which are only within the blur radius. The alpha is 1 if any face
+        # contains the pixel center.
+        inside = _valid_mask(fragments) & (fragments.dists < 0)
+        alpha = inside.any(dim=-1).to(colors.dtype)
+    else:
+        alpha = _sigmoid_alpha(
+            fragments.dists, fragments.pix_to_face, blend_params.sigma
+        )
+    return torch.cat([rgb, alpha[..., None]], dim=-1)  # (N, H, W, 4)
+
+
+# Wrapper for the C++/CUDA Implementation of softmax rgb blend.
+class _SoftmaxRGBBlend(torch.autograd.Function):
+    @staticmethod
+    def forward(
+        ctx, colors, dists, zbuf, pix_to_face, background, sigma, gamma, znear, zfar
+    ):
+        pix_to_face = _int64_pix_to_face(pix_to_face)
+        pixel_colors, z_inv_max, denom = _C.softmax_rgb_blend(
+            colors, dists, zbuf, pix_to_face, background, sigma, gamma, znear, zfar
+        )
+        # Only the (N, H, W) reductions are saved in addition to the inputs,
+        # the per face terms are recomputed in the backward pass.
+        ctx.save_for_backward(
+            colors, dists, zbuf, pix_to_face, background, pixel_colors, z_inv_max, denom
+        )
+        ctx.sigma = sigma
+        ctx.gamma = gamma
+        ctx.znear = znear
+        ctx.zfar = zfar
+        return pixel_colors
+
+    @staticmethod
+    def backward(ctx, grad_pixel_colors):
+        (
+            colors,
+            dists,
+            zbuf,
+            pix_to_face,
+            background,
+            pixel_colors,
+            z_inv_max,
+            denom,
+        ) = ctx.saved_tensors
+        grad_pixel_colors = grad_pixel_colors.contiguous()
+        grad_colors, grad_dists, grad_zbuf = _C.softmax_rgb_blend_backward(
+            grad_pixel_colors,
+            pixel_colors,
+            z_inv_max,
+            denom,
+            colors,
+            dists,
+            zbuf,
+            pix_to_face,
+            background,
+            ctx.sigma,
+            ctx.gamma,
+            ctx.znear,
+            ctx.zfar,
+        )
+        grad_background = None
+        if ctx.needs_input_grad[4]:
+            # The background color is weighted by delta / denom at each pixel.
+            eps = 1e-10
+            delta = torch.exp((eps - z_inv_max) / ctx.gamma).clamp(min=eps)
+            weight = (delta / denom)[..., None]
+            grad_background = (grad_pixel_colors[..., :3] * weight).sum(dim=(0, 1, 2))
+        return (
+            grad_colors,
+            grad_dists,
+            grad_zbuf,
+            None,
+            grad_background,
+            None,
+            None,
+            None,
+            None,
+        )
+
+
+# pyre-fixme[16]: `_SoftmaxRGBBlend` has no attribute `apply`.
+_softmax_rgb = _SoftmaxRGBBlend.apply
 
 
 def softmax_rgb_blend(
@@ -130,8 +211,8 @@ def softmax_rgb_blend(
     Args:
         colors: (N, H, W, K, 3) RGB color for each of the top K faces per pixel.
         fragments: namedtuple with outputs of rasterization. We use properties
-            - pix_to_face: LongTensor of shape (N, H, W, K) specifying the indices
-              of the faces (in the packed representation) which
+            - pix_to_face: LongTensor or IntTensor of shape (N, H, W, K) specifying
+              the indices of the faces (in the packed representation) which
               overlap each pixel in the image.
             - dists: FloatTensor of shape (N, H, W, K) specifying
               the 2D euclidean distance from the center of each pixel
@@ -143,10 +224,15 @@ def softmax_rgb_blend(
             - sigma: float, parameter which controls the width of the sigmoid
               function used to calculate the 2D distance based probability.
               Sigma controls the sharpness of the edges of the shape.
+              For sigma = 0 and K = 1 the probability map is 1 where the face
+              contains the pixel center and 0 otherwise.
             - gamma: float, parameter which controls the scaling of the
               exponential function used to control the opacity of the color.
             - background_color: (3) element list/tuple/torch.Tensor specifying
               the RGB values for the background color.
+            - dtype: optional reduced precision dtype, e.g. torch.float16 on
+              the GPU, in which the colors are read and accumulated. The normalization
+              and the output stay in the precision of zbuf.
         znear: float, near clipping plane in the z direction
         zfar: float, far clipping plane in the z direction
 
@@ -157,55 +243,203 @@ def softmax_rgb_blend(
     Image-based 3D Reasoning'
     """
 
-    N, H, W, K = fragments.pix_to_face.shape
     device = fragments.pix_to_face.device
-    pixel_colors = torch.ones((N, H, W, 4), dtype=colors.dtype, device=colors.device)
-    background = blend_params.background_color
-    if not torch.is_tensor(background):
-        background = torch.tensor(background, dtype=torch.float32, device=device)
-    else:
-        background = background.to(device)
+    background = _background_color_tensor(blend_params, colors)
 
+    if blend_params.sigma == 0 and fragments.pix_to_face.shape[-1] == 1:
+        return _softmax_rgb_blend_single_face(
+            colors, fragments, background, blend_params.gamma, znear, zfar
+        )
+
+    # The C++/CUDA implementation takes a single znear/zfar value and requires
+    # all inputs to be float32. Per camera values (e.g. from a batch of
+    # FoVPerspectiveCameras), reduced precision colors and float64 or mixed
+    # dtype inputs use the PyTorch implementation, which promotes the dtypes.
+    dtype = blend_params.dtype
+    tensors = (colors, fragments.dists, fragments.zbuf, background)
+    if dtype is not None and dtype != colors.dtype:
+        colors = colors.to(dtype)
+    elif (
+        _is_scalar(znear)
+        and _is_scalar(zfar)
+        and all(t.dtype == torch.float32 for t in tensors)
+    ):
+        return _softmax_rgb(
+            colors,
+            fragments.dists,
+            fragments.zbuf,
+            fragments.pix_to_face,
+            background,
+            float(blend_params.sigma),
+            float(blend_params.gamma),
+            float(znear),
+            float(zfar),
+        )
+
+    # znear/zfar are resolved to tensors before calling into the scripted function.
+    znear = torch.as_tensor(znear, dtype=fragments.zbuf.dtype, device=device)
+    zfar = torch.as_tensor(zfar, dtype=fragments.zbuf.dtype, device=device)
+
+    return _softmax_blend_core(
+        colors,
+        fragments.dists,
+        fragments.zbuf,
+        _valid_mask(fragments),
+        background,
+        float(blend_params.sigma),
+        float(blend_params.gamma),
+        znear,
+        zfar,
+    )
+
+
+def _softmax_rgb_blend_single_face(
+    colors, fragments, background, gamma, znear, zfar
+) -> torch.Tensor:
+    """
+    softmax_rgb_blend for K = 1 in the limit sigma -> 0. The probability map
+    is then 1 where the face contains the pixel center (dists < 0) and 0
+    otherwise, so the color is a blend of the face color and the background
+    without any reduction over K.
+    """
+    eps = 1e-10
+    valid = _valid_mask(fragments)[..., :1]  # (N, H, W, 1)
+    prob_map = (valid & (fragments.dists[..., :1] < 0)).to(colors.dtype)
+    z_inv = (zfar - fragments.zbuf[..., :1]) / (zfar - znear) * valid
+    z_inv_max = z_inv.clamp(min=eps)
+    weights_num = prob_map * torch.exp((z_inv - z_inv_max) / gamma)
+    delta = torch.exp((eps - z_inv_max) / gamma).clamp(min=eps)
+    denom = weights_num + delta
+    rgb = (weights_num * colors[..., 0, :] + delta * background) / denom
+    return torch.cat([rgb, prob_map], dim=-1)  # (N, H, W, 4)
+
+
+def _background_color_tensor(blend_params, colors) -> torch.Tensor:
+    """
+    Return blend_params.background_color as a tensor with the dtype and device
+    of colors. A tensor background color is used as is when it already matches
+    colors, in which case .to() does not copy. Sequences are converted once per
+    dtype and device and then reused, instead of being copied to the device in
+    every call.
+    """
+    background_color = blend_params.background_color
+    if torch.is_tensor(background_color):
+        return background_color.to(colors)
+    return _cached_color_tensor(tuple(background_color), colors.dtype, colors.device)
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_color_tensor(color, dtype, device) -> torch.Tensor:
+    # The cached tensors are shared between calls and must not be modified.
+    return torch.tensor(color, dtype=dtype, device=device)
+
+
+def _valid_mask(fragments) -> torch.Tensor:
+    """
+    Return the (N, H, W, K) mask of the faces overlapping each pixel, i.e.
+    pix_to_face >= 0. The mask computed by the rasterizer is reused when the
+    fragments have one.
+    """
+    valid_mask = getattr(fragments, "valid_mask", None)
+    if valid_mask is None:
+        valid_mask = fragments.pix_to_face >= 0
+    return valid_mask
+
+
+def _int64_pix_to_face(pix_to_face) -> torch.Tensor:
+    # The C++/CUDA kernels index pix_to_face as int64, so int32 inputs are upcast.
+    return pix_to_face.long()
+
+
+def _is_scalar(x) -> bool:
+    return not torch.is_tensor(x) or x.numel() == 1
+
+
+# torch.amax (added in PyTorch 1.7) reduces without allocating the argmax
+# indices which torch.max returns. Fall back to torch.max on older versions.
+if hasattr(torch, "amax"):
+
+    @torch.jit.script
+    def _max_over_k(x: torch.Tensor) -> torch.Tensor:
+        return torch.amax(x, dim=-1, keepdim=True)
+
+else:
+
+    @torch.jit.script
+    def _max_over_k(x: torch.Tensor) -> torch.Tensor:
+        return torch.max(x, dim=-1, keepdim=True)[0]
+
+
+@torch.jit.script
+def _softmax_blend_core(
+    colors: torch.Tensor,
+    dists: torch.Tensor,
+    zbuf: torch.Tensor,
+    mask: torch.Tensor,
+    background: torch.Tensor,
+    sigma: float,
+    gamma: float,
+    znear: torch.Tensor,
+    zfar: torch.Tensor,
+) -> torch.Tensor:
+    """
+    Pure tensor implementation of softmax_rgb_blend. This is scripted so that
+    the elementwise ops and the reductions over K can be fused instead of
+    materializing each (N, H, W, K) intermediate separately. mask is the
+    (N, H, W, K) boolean mask of the faces overlapping each pixel.
+    """
     # Weight for background color
     eps = 1e-10
 
-    # Mask for padded pixels.
-    mask = fragments.pix_to_face >= 0
+    # Scalar factors are computed once instead of dividing each (N, H, W, K)
+    # tensor elementwise.
+    neg_inv_sigma = -1.0 / sigma
+    inv_gamma = 1.0 / gamma
+    z_scale = 1.0 / (zfar - znear)
 
     # Sigmoid probability map based on the distance of the pixel to the face.
-    prob_map = torch.sigmoid(-fragments.dists / blend_params.sigma) * mask
+    prob_map = torch.sigmoid(dists * neg_inv_sigma) * mask
 
     # The cumulative product ensures that alpha will be 0.0 if at least 1
     # face fully covers the pixel as for that face, prob will be 1.0.
     # This results in a multiplication by 0.0 because of the (1.0 - prob)
     # term. Therefore 1.0 - alpha will be 1.0.
-    alpha = torch.prod((1.0 - prob_map), dim=-1)
+    # The product is computed as a sum of log1p(-prob) so that it is a plain
+    # reduction over K, which is also stable for small probabilities and has a
+    # cheap backward pass. Faces with prob == 1.0 would give log(0) and nan
+    # gradients, so they are masked out and contribute log(eps) instead.
+    full_cover = prob_map >= 1.0
+    log_prob = torch.log1p(-prob_map.masked_fill(full_cover, 0.0))
+    log_prob = log_prob.masked_fill(full_cover, math.log(eps))
+    alpha = torch.exp(log_prob.sum(dim=-1))
 
     # Weights for each face. Adjust the exponential by the max z to prevent
     # overflow. zbuf shape (N, H, W, K), find max over K.
     # TODO: there may still be some instability in the exponent calculation.
 
-    z_inv = (zfar - fragments.zbuf) / (zfar - znear) * mask
-    # pyre-fixme[16]: `Tuple` has no attribute `values`.
-    # pyre-fixme[6]: Expected `Tensor` for 1st param but got `float`.
-    z_inv_max = torch.max(z_inv, dim=-1).values[..., None].clamp(min=eps)
-    # pyre-fixme[6]: Expected `Tensor` for 1st param but got `float`.
-    weights_num = prob_map * torch.exp((z_inv - z_inv_max) / blend_params.gamma)
+    z_inv = (zfar - zbuf) * z_scale * mask
+    z_inv_max = _max_over_k(z_inv).clamp(min=eps)
+    weights_num = prob_map * torch.exp((z_inv - z_inv_max) * inv_gamma)
 
     # Also apply exp normalize trick for the background color weight.
     # Clamp to ensure delta is never 0.
-    # pyre-fixme[20]: Argument `max` expected.
-    # pyre-fixme[6]: Expected `Tensor` for 1st param but got `float`.
-    delta = torch.exp((eps - z_inv_max) / blend_params.gamma).clamp(min=eps)
+    delta = torch.exp((eps - z_inv_max) * inv_gamma).clamp(min=eps)
 
     # Normalize weights.
     # weights_num shape: (N, H, W, K). Sum over K and divide through by the sum.
     denom = weights_num.sum(dim=-1)[..., None] + delta
 
     # Sum: weights * textures + background color
-    weighted_colors = (weights_num[..., None] * colors).sum(dim=-2)
+    # Contract over K directly instead of materializing the (N, H, W, K, 3)
+    # product of the weights and the colors.
+    # If the colors are in reduced precision the weights are cast to match for
+    # the contraction, the result is accumulated in the precision of zbuf.
+    weighted_colors = torch.einsum(
+        "nhwk,nhwkc->nhwc", [weights_num.to(colors.dtype), colors]
+    ).to(denom.dtype)
     weighted_background = delta * background
-    pixel_colors[..., :3] = (weighted_colors + weighted_background) / denom
-    pixel_colors[..., 3] = 1.0 - alpha
+    rgb = (weighted_colors + weighted_background) / denom  # (N, H, W, 3)
 
-    return pixel_colors
+    # Assemble the RGBA image from the final tensors rather than filling a
+    # preallocated buffer in place.
+    return torch.cat([rgb, (1.0 - alpha)[..., None]], dim=-1)  # (N, H, W, 4)
@@ -12,6 +12,26 @@ from pytorch3d import _C
 # This can be an image (C=3) or a set of features.
 
 
+def _split_background_grad(ctx, grad_output, points_idx):
+    """
+    The compositing kernels write the background color to every pixel with no
+    points, i.e. points_idx[n, 0, y, x] < 0, so these pixels do not depend on the
+    features or alphas even if later points_idx[n, k, y, x] are valid.
+
+    Returns:
+        grad_output: grad_output with the background pixels set to zero, to be
+            passed to the backward kernels.
+        grad_background_color: Gradient w.r.t. the background color, or None.
+    """
+    if not ctx.has_background:
+        return grad_output, None
+    is_background = (points_idx[:, :1] < 0).to(grad_output.dtype)
+    grad_background_color = None
+    if ctx.needs_input_grad[3]:
+        grad_background_color = (grad_output * is_background).sum(dim=(0, 2, 3))
+    return grad_output * (1.0 - is_background), grad_background_color
+
+
 class _CompositeAlphaPoints(torch.autograd.Function):
     """
     Composite features within a z-buffer using alpha compositing. Given a z-buffer
@@ -40,9 +60,10 @@ class _CompositeAlphaPoints(torch.autograd.Function):
     """
 
     @staticmethod
-    def forward(ctx, features, alphas, points_idx):
-        pt_cld = _C.accum_alphacomposite(features, alphas, points_idx)
+    def forward(ctx, features, alphas, points_idx, background_color):
+        pt_cld = _C.accum_alphacomposite(features, alphas, points_idx, background_color)
 
+        ctx.has_background = background_color.numel() > 0
         ctx.save_for_backward(features.clone(), alphas.clone(), points_idx.clone())
         return pt_cld
 
@@ -53,14 +74,17 @@ class _CompositeAlphaPoints(torch.autograd.Function):
         grad_points_idx = None
         features, alphas, points_idx = ctx.saved_tensors
 
+        grad_output, grad_background_color = _split_background_grad(
+            ctx, grad_output, points_idx
+        )
         grad_features, grad_alphas = _C.accum_alphacomposite_backward(
             grad_output, features, alphas, points_idx
         )
 
-        return grad_features, grad_alphas, grad_points_idx, None
+        return grad_features, grad_alphas, grad_points_idx, grad_background_color
 
 
-def alpha_composite(pointsidx, alphas, pt_clds) -> torch.Tensor:
+def alpha_composite(pointsidx, alphas, pt_clds, background_color=None) -> torch.Tensor:
     """
     Composite features within a z-buffer using alpha compositing. Given a z-buffer
     with corresponding features and weights, these values are accumulated according
@@ -83,13 +107,20 @@ def alpha_composite(pointsidx, alphas, pt_clds) -> torch.Tensor:
             Concretely pointsidx[n, k, y, x] = p means that features[n, :, p] is the
             feature of the kth closest point (along the z-direction) to pixel (y, x) in
             batch element n. This is weighted by alphas[n, k, y, x].
+        background_color: Optional Tensor of shape (C,) giving the features of
+            pixels which have no points, i.e. pointsidx[n, 0, y, x] < 0. If None,
+            these pixels are left as zero. Gradients are propagated to
+            background_color if it requires grad.
 
     Returns:
         Combined features: Tensor of shape (N, C, image_size, image_size)
             giving the accumulated features at each point.
     """
+    if background_color is None:
+        # An empty tensor indicates that no background color is applied.
+        background_color = pt_clds.new_empty(0)
     # pyre-fixme[16]: `_CompositeAlphaPoints` has no attribute `apply`.
-    return _CompositeAlphaPoints.apply(pt_clds, alphas, pointsidx)
+    return _CompositeAlphaPoints.apply(pt_clds, alphas, pointsidx, background_color)
 
 
 class _CompositeNormWeightedSumPoints(torch.autograd.Function):
@@ -120,9 +151,12 @@ class _CompositeNormWeightedSumPoints(torch.autograd.Function):
     """
 
     @staticmethod
-    def forward(ctx, features, alphas, points_idx):
-        pt_cld = _C.accum_weightedsumnorm(features, alphas, points_idx)
+    def forward(ctx, features, alphas, points_idx, background_color):
+        pt_cld = _C.accum_weightedsumnorm(
+            features, alphas, points_idx, background_color
+        )
 
+        ctx.has_background = background_color.numel() > 0
         ctx.save_for_backward(features.clone(), alphas.clone(), points_idx.clone())
         return pt_cld
 
@@ -133,14 +167,19 @@ class _CompositeNormWeightedSumPoints(torch.autograd.Function):
         grad_points_idx = None
         features, alphas, points_idx = ctx.saved_tensors
 
+        grad_output, grad_background_color = _split_background_grad(
+            ctx, grad_output, points_idx
+        )
         grad_features, grad_alphas = _C.accum_weightedsumnorm_backward(
             grad_output, features, alphas, points_idx
         )
 
-        return grad_features, grad_alphas, grad_points_idx, None
+        return grad_features, grad_alphas, grad_points_idx, grad_background_color
 
 
-def norm_weighted_sum(pointsidx, alphas, pt_clds) -> torch.Tensor:
+def norm_weighted_sum(
+    pointsidx, alphas, pt_clds, background_color=None
+) -> torch.Tensor:
     """
     Composite features within a z-buffer using normalized weighted sum. Given a z-buffer
     with corresponding features and weights, these values are accumulated
@@ -162,13 +201,22 @@ def norm_weighted_sum(pointsidx, alphas, pt_clds) -> torch.Tensor:
             Concretely pointsidx[n, k, y, x] = p means that features[:, p] is the
             feature of the kth closest point (along the z-direction) to pixel (y, x) in
             batch element n. This is weighted by alphas[n, k, y, x].
+        background_color: Optional Tensor of shape (C,) giving the features of
+            pixels which have no points, i.e. pointsidx[n, 0, y, x] < 0. If None,
+            these pixels are left as zero. Gradients are propagated to
+            background_color if it requires grad.
 
     Returns:
         Combined features: Tensor of shape (N, C, image_size, image_size)
             giving the accumulated features at each point.
     """
+    if background_color is None:
+        # An empty tensor indicates that no background color is applied.
+        background_color = pt_clds.new_empty(0)
     # pyre-fixme[16]: `_CompositeNormWeightedSumPoints` has no attribute `apply`.
-    return _CompositeNormWeightedSumPoints.apply(pt_clds, alphas, pointsidx)
+    return _CompositeNormWeightedSumPoints.apply(
+        pt_clds, alphas, pointsidx, background_color
+    )
 
 
 class _CompositeWeightedSumPoints(torch.autograd.Function):
@@ -14,6 +14,8 @@ class Fragments(NamedTuple):
     zbuf: torch.Tensor
     bary_coords: torch.Tensor
     dists: torch.Tensor
+    # Optional precomputed (pix_to_face >= 0) mask shared by the blending functions.
+    valid_mask: Optional[torch.Tensor] = None
 
 
 # Class to store the mesh rasterization params with defaults
@@ -75,11 +77,59 @@ class MeshRasterizer(nn.Module):
 
         self.cameras = cameras
         self.raster_settings = raster_settings
+        self.invalidate_cache()
 
     def to(self, device):
         # Manually move to device cameras as it is not a subclass of nn.Module
         if self.cameras is not None:
             self.cameras = self.cameras.to(device)
+        self.invalidate_cache()
+
+    def invalidate_cache(self) -> None:
+        """
+        Clear the cached world to view and projection transforms of the cameras.
+        The cache is keyed on the identity and version of the camera tensors, so
+        this is only needed if the cameras are modified in a way that does
+        not change their tensors, e.g. by updating non tensor attributes.
+        """
+        self._cached_camera_key = None
+        self._cached_camera_tensors = None
+        self._cached_world_to_view = None
+        self._cached_proj = None
+
+    def _get_camera_transforms(self, cameras, kwargs: dict):
+        """
+        Return the world to view and projection transforms of the cameras,
+        reusing the transforms of the previous call when the cameras have not
+        changed. The cache is bypassed if kwargs override any of the camera
+        parameters or if the camera tensors require gradients.
+
+        kwargs are the keyword arguments of the forward pass. They are taken as
+        a dict rather than unpacked, as they may contain "cameras" themselves.
+        """
+        camera_tensors = [v for v in vars(cameras).values() if torch.is_tensor(v)]
+        use_cache = not any(hasattr(cameras, k) for k in kwargs) and not (
+            torch.is_grad_enabled() and any(t.requires_grad for t in camera_tensors)
+        )
+        if not use_cache:
+            world_to_view = cameras.get_world_to_view_transform(**kwargs)
+            proj = cameras.get_projection_transform(**kwargs)
+            return world_to_view, proj
+
+        # In place updates of the camera tensors bump their version counter and
+        # reassigning a camera attribute changes the id of the tensor.
+        key = (id(cameras),) + tuple(
+            (k, id(v), v._version) if torch.is_tensor(v) else (k, v)
+            for k, v in sorted(vars(cameras).items())
+            if torch.is_tensor(v) or isinstance(v, (bool, int, float, str))
+        )
+        if key != self._cached_camera_key:
+            self._cached_world_to_view = cameras.get_world_to_view_transform(**kwargs)
+            self._cached_proj = cameras.get_projection_transform(**kwargs)
+            self._cached_camera_key = key
+            # Keep references to the tensors so that their ids are not reused.
+            self._cached_camera_tensors = camera_tensors
+        return self._cached_world_to_view, self._cached_proj
 
     def transform(self, meshes_world, **kwargs) -> torch.Tensor:
         """
@@ -110,13 +160,10 @@ class MeshRasterizer(nn.Module):
         # NOTE: Retaining view space z coordinate for now.
         # TODO: Revisit whether or not to transform z coordinate to [-1, 1] or
         # [0, 1] range.
-        verts_view = cameras.get_world_to_view_transform(**kwargs).transform_points(
-            verts_world
-        )
-        verts_screen = cameras.get_projection_transform(**kwargs).transform_points(
-            verts_view
-        )
-        verts_screen[..., 2] = verts_view[..., 2]
+        world_to_view, proj = self._get_camera_transforms(cameras, kwargs)
+        verts_view = world_to_view.transform_points(verts_world)
+        verts_screen = proj.transform_points(verts_view)
+        verts_screen = torch.cat([verts_screen[..., :2], verts_view[..., 2:3]], dim=-1)
         meshes_screen = meshes_world.update_padded(new_verts_padded=verts_screen)
         return meshes_screen
 
@@ -152,5 +199,9 @@ class MeshRasterizer(nn.Module):
             cull_backfaces=raster_settings.cull_backfaces,
         )
         return Fragments(
-            pix_to_face=pix_to_face, zbuf=zbuf, bary_coords=bary_coords, dists=dists
+            pix_to_face=pix_to_face,
+            zbuf=zbuf,
+            bary_coords=bary_coords,
+            dists=dists,
+            valid_mask=pix_to_face >= 0,
         )
@@ -63,6 +63,7 @@ class HardPhongShader(nn.Module):
                 or in the forward pass of HardPhongShader"
             raise ValueError(msg)
 
+        fragments = _nearest_face_fragments(fragments)
         texels = meshes.sample_textures(fragments)
         lights = kwargs.get("lights", self.lights)
         materials = kwargs.get("materials", self.materials)
@@ -182,6 +183,8 @@ class HardGouraudShader(nn.Module):
         materials = kwargs.get("materials", self.materials)
         blend_params = kwargs.get("blend_params", self.blend_params)
 
+        fragments = _nearest_face_fragments(fragments)
+
         # As Gouraud shading applies the illumination to the vertex
         # colors, the interpolated pixel texture is calculated in the
         # shading step. In comparison, for Phong shading, the pixel
@@ -315,6 +318,7 @@ class HardFlatShader(nn.Module):
             msg = "Cameras must be specified either at initialization \
                 or in the forward pass of HardFlatShader"
             raise ValueError(msg)
+        fragments = _nearest_face_fragments(fragments)
         texels = meshes.sample_textures(fragments)
         lights = kwargs.get("lights", self.lights)
         materials = kwargs.get("materials", self.materials)
@@ -357,7 +361,30 @@ class SoftSilhouetteShader(nn.Module):
         Only want to render the silhouette so RGB values can be ones.
         There is no need for lighting or texturing
         """
-        colors = torch.ones_like(fragments.bary_coords)
+        # sigmoid_alpha_blend only reads the color of the closest face.
+        colors = torch.ones_like(fragments.bary_coords[..., :1, :])
         blend_params = kwargs.get("blend_params", self.blend_params)
         images = sigmoid_alpha_blend(colors, fragments, blend_params)
         return images
+
+
+def _nearest_face_fragments(fragments):
+    """
+    Slice the fragments to the closest face per pixel, i.e. K = 1. The hard
+    shaders blend with hard_rgb_blend, which only uses the color of the closest
+    face, so this avoids texturing and shading the other K - 1 faces, and the
+    colors computed from the sliced fragments are contiguous rather than
+    strided views into a K-wide tensor.
+    """
+    if fragments.pix_to_face.shape[-1] == 1:
+        return fragments
+    # The slices are made contiguous as the texturing and interpolation ops
+    # flatten them with view().
+    valid_mask = getattr(fragments, "valid_mask", None)
+    return fragments._replace(
+        pix_to_face=fragments.pix_to_face[..., :1].contiguous(),
+        zbuf=fragments.zbuf[..., :1].contiguous(),
+        bary_coords=fragments.bary_coords[..., :1, :].contiguous(),
+        dists=fragments.dists[..., :1].contiguous(),
+        valid_mask=None if valid_mask is None else valid_mask[..., :1].contiguous(),
+    )
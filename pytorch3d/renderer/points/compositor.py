@@ -24,16 +24,17 @@ class AlphaCompositor(nn.Module):
     ):
         super().__init__()
         self.background_color = background_color
+        # Converted background color, refreshed lazily in forward.
+        self._background_color_cache = None
 
     def forward(self, fragments, alphas, ptclds, **kwargs) -> torch.Tensor:
-        background_color = kwargs.get("background_color", self.background_color)
-        images = alpha_composite(fragments, alphas, ptclds)
+        if "background_color" in kwargs:
+            background_color = _get_background_color(ptclds, kwargs["background_color"])
+        else:
+            background_color = _cached_background_color(self, ptclds)
 
         # images are of shape (N, C, H, W)
-        # check for background color & feature size C (C=4 indicates rgba)
-        if background_color is not None and images.shape[1] == 4:
-            return _add_background_color_to_images(fragments, images, background_color)
-        return images
+        return alpha_composite(fragments, alphas, ptclds, background_color)
 
 
 class NormWeightedCompositor(nn.Module):
@@ -46,40 +47,68 @@ class NormWeightedCompositor(nn.Module):
     ):
         super().__init__()
         self.background_color = background_color
+        # Converted background color, refreshed lazily in forward.
+        self._background_color_cache = None
 
     def forward(self, fragments, alphas, ptclds, **kwargs) -> torch.Tensor:
-        background_color = kwargs.get("background_color", self.background_color)
-        images = norm_weighted_sum(fragments, alphas, ptclds)
+        if "background_color" in kwargs:
+            background_color = _get_background_color(ptclds, kwargs["background_color"])
+        else:
+            background_color = _cached_background_color(self, ptclds)
 
         # images are of shape (N, C, H, W)
-        # check for background color & feature size C (C=4 indicates rgba)
-        if background_color is not None and images.shape[1] == 4:
-            return _add_background_color_to_images(fragments, images, background_color)
-        return images
+        return norm_weighted_sum(fragments, alphas, ptclds, background_color)
 
 
-def _add_background_color_to_images(pix_idxs, images, background_color):
+def _cached_background_color(compositor, features) -> Optional[torch.Tensor]:
     """
-    Mask pixels in images without corresponding points with a given background_color.
+    Return _get_background_color(features, compositor.background_color), reusing
+    the tensor from the previous call while the background color, and the dtype,
+    device and number of channels of the features, are unchanged. This avoids
+    copying the background color to the device in every forward pass.
+    """
+    background_color = compositor.background_color
+    if torch.is_tensor(background_color):
+        if background_color.requires_grad:
+            # Don't keep the autograd graph of a previous forward pass alive.
+            return _get_background_color(features, background_color)
+        value = (background_color._version,)
+    elif background_color is not None:
+        value = tuple(background_color)
+    else:
+        value = None
+    key = (value, features.dtype, features.device, features.shape[0])
+    cache = compositor._background_color_cache
+    if cache is None or cache[0] is not background_color or cache[1] != key:
+        tensor = _get_background_color(features, background_color)
+        cache = (background_color, key, tensor)
+        compositor._background_color_cache = cache
+    return cache[2]
+
+
+def _get_background_color(features, background_color) -> Optional[torch.Tensor]:
+    """
+    Convert the background color to the rgba tensor which is passed to the
+    compositing functions. Pixels without corresponding points are set to this
+    color inside the compositing kernels.
 
     Args:
-        pix_idxs: int32 Tensor of shape (N, points_per_pixel, image_size, image_size)
-            giving the indices of the nearest points at each pixel, sorted in z-order.
-        images: Tensor of shape (N, 4, image_size, image_size) giving the
-            accumulated features at each point, where 4 refers to a rgba feature.
+        features: Packed Tensor of shape (C, P) giving the features of each point.
         background_color: Tensor, list, or tuple with 3 or 4 values indicating the rgb/rgba
             value for the new background. Values should be in the interval [0,1].
-     Returns:
-        images: Tensor of shape (N, 4, image_size, image_size), where pixels with
-            no nearest points have features set to the background color, and other
-            pixels with accumulated features have unchanged values.
+    Returns:
+        background_color: Tensor of shape (4,) with the same dtype and device as
+            features, or None if no background color should be applied, i.e. if
+            background_color is None or has the wrong shape, or if the features
+            are not rgba (C != 4).
     """
-    # Initialize background mask
-    background_mask = pix_idxs[:, 0] < 0  # (N, image_size, image_size)
+    # check for background color & feature size C (C=4 indicates rgba)
+    if background_color is None or features.shape[0] != 4:
+        return None
 
     # Convert background_color to an appropriate tensor and check shape
     if not torch.is_tensor(background_color):
-        background_color = images.new_tensor(background_color)
+        background_color = features.new_tensor(background_color)
 
     background_shape = background_color.shape
 
@@ -88,21 +117,13 @@ def _add_background_color_to_images(pix_idxs, images, background_color):
             "Background color should be size (3) or (4), but is size %s instead"
             % (background_shape,)
         )
-        return images
+        return None
 
-    background_color = background_color.to(images)
+    background_color = background_color.to(features)
 
     # add alpha channel
     if background_shape[0] == 3:
-        alpha = images.new_ones(1)
+        alpha = features.new_ones(1)
         background_color = torch.cat([background_color, alpha])
 
-    num_background_pixels = background_mask.sum()
-
-    # permute so that features are the last dimension for masked_scatter to work
-    masked_images = images.permute(0, 2, 3, 1)[..., :4].masked_scatter(
-        background_mask[..., None],
-        background_color[None, :].expand(num_background_pixels, -1),
-    )
-
-    return masked_images.permute(0, 3, 1, 2)
+    return background_color
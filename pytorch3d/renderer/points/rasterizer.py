@@ -95,7 +95,7 @@ class PointsRasterizer(nn.Module):
         pts_screen = cameras.get_projection_transform(**kwargs).transform_points(
             pts_view
         )
-        pts_screen[..., 2] = pts_view[..., 2]
+        pts_screen = torch.cat([pts_screen[..., :2], pts_view[..., 2:3]], dim=-1)
         point_clouds = point_clouds.update_padded(pts_screen)
         return point_clouds
 
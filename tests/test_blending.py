@@ -6,6 +6,8 @@ import torch
 from common_testing import TestCaseMixin
 from pytorch3d.renderer.blending import (
     BlendParams,
+    _background_color_tensor,
+    _softmax_blend_core,
     hard_rgb_blend,
     sigmoid_alpha_blend,
     softmax_rgb_blend,
@@ -106,8 +108,8 @@ def softmax_blend_naive(colors, fragments, blend_params):
         for h in range(H):
             for w in range(W):
                 alpha = 1.0
-                weights_k = torch.zeros(K, device=device)
-                zmax = torch.tensor(0.0, device=device)
+                weights_k = torch.zeros(K, dtype=zbuf.dtype, device=device)
+                zmax = torch.tensor(0.0, dtype=zbuf.dtype, device=device)
 
                 # Loop over K to find max z.
                 for k in range(K):
@@ -322,6 +324,219 @@ class TestBlending(TestCaseMixin, unittest.TestCase):
             compare_grads=True,
         )
 
+    def _test_softmax_rgb_blend_custom(self, device):
+        """
+        Test outputs and gradients of the C++/CUDA implementation against
+        the PyTorch implementation.
+        """
+        torch.manual_seed(231)
+        N, S, K = 2, 8, 5
+        F = 32  # number of faces in the mesh
+        pix_to_face = torch.randint(low=-1, high=F, size=(N, S, S, K), device=device)
+        dists = torch.randn(size=(N, S, S, K), device=device) * 1e-2
+        zbuf = torch.rand(size=(N, S, S, K), device=device) * 5 + 1.0
+        colors = torch.rand((N, S, S, K, 3), device=device)
+        background = torch.tensor([0.2, 0.3, 0.4], device=device)
+        blend_params = BlendParams(sigma=1e-2, gamma=1e-1, background_color=background)
+
+        inputs1 = [t.clone().requires_grad_(True) for t in (colors, dists, zbuf)]
+        inputs2 = [t.clone().requires_grad_(True) for t in (colors, dists, zbuf)]
+        fragments = Fragments(
+            pix_to_face=pix_to_face,
+            bary_coords=torch.tensor([], device=device),  # dummy
+            zbuf=inputs1[2],
+            dists=inputs1[1],
+        )
+        out1 = softmax_rgb_blend(inputs1[0], fragments, blend_params)
+        out2 = _softmax_blend_core(
+            inputs2[0],
+            inputs2[1],
+            inputs2[2],
+            pix_to_face >= 0,
+            background,
+            blend_params.sigma,
+            blend_params.gamma,
+            torch.tensor(1.0, device=device),
+            torch.tensor(100.0, device=device),
+        )
+        self.assertClose(out1, out2, atol=1e-6)
+
+        grad_out = torch.randn_like(out1)
+        (out1 * grad_out).sum().backward()
+        (out2 * grad_out).sum().backward()
+        for t1, t2 in zip(inputs1, inputs2):
+            self.assertClose(t1.grad, t2.grad, atol=1e-4, rtol=1e-4)
+
+    def test_softmax_rgb_blend_float64(self):
+        """
+        Test that float64 and mixed dtype inputs are blended with the precision
+        of the inputs, matching the naive implementation.
+        """
+        torch.manual_seed(231)
+        N, S, K = 1, 4, 3
+        F = 32  # number of faces in the mesh
+        device = torch.device("cpu")
+        pix_to_face = torch.randint(low=-1, high=F, size=(N, S, S, K), device=device)
+        dists = torch.randn(size=(N, S, S, K), dtype=torch.float64) * 1e-2
+        zbuf = torch.rand(size=(N, S, S, K), dtype=torch.float64) * 5 + 1.0
+        colors = torch.rand((N, S, S, K, 3), dtype=torch.float64)
+        fragments = Fragments(
+            pix_to_face=pix_to_face,
+            bary_coords=torch.tensor([], device=device),  # dummy
+            zbuf=zbuf,
+            dists=dists,
+        )
+        blend_params = BlendParams(sigma=1e-2, gamma=1e-1)
+        out = softmax_rgb_blend(colors, fragments, blend_params)
+        out_ref = softmax_blend_naive(colors, fragments, blend_params)
+        self.assertEqual(out.dtype, torch.float64)
+        self.assertClose(out, out_ref, atol=1e-12)
+
+        # float32 colors with float64 distances and depths.
+        out_mixed = softmax_rgb_blend(colors.float(), fragments, blend_params)
+        self.assertClose(out_mixed.double(), out_ref, atol=1e-6)
+
+    def test_blend_int32_pix_to_face(self):
+        """
+        Test that the blending functions give the same result for int32 and
+        int64 pix_to_face.
+        """
+        torch.manual_seed(231)
+        N, S, K = 2, 8, 5
+        F = 32  # number of faces in the mesh
+        device = torch.device("cpu")
+        pix_to_face = torch.randint(low=-1, high=F, size=(N, S, S, K), device=device)
+        dists = torch.randn(size=(N, S, S, K), device=device) * 1e-2
+        zbuf = torch.rand(size=(N, S, S, K), device=device) * 5 + 1.0
+        colors = torch.rand((N, S, S, K, 3), device=device)
+        blend_params = BlendParams(sigma=1e-2, gamma=1e-1)
+        empty = torch.tensor([], device=device)
+
+        fragments64 = Fragments(
+            pix_to_face=pix_to_face, bary_coords=empty, zbuf=zbuf, dists=dists
+        )
+        fragments32 = Fragments(
+            pix_to_face=pix_to_face.int(), bary_coords=empty, zbuf=zbuf, dists=dists
+        )
+        for blend_fn in (hard_rgb_blend, sigmoid_alpha_blend, softmax_rgb_blend):
+            out64 = blend_fn(colors, fragments64, blend_params)
+            out32 = blend_fn(colors, fragments32, blend_params)
+            self.assertClose(out32, out64)
+
+    def test_softmax_rgb_blend_half_colors(self):
+        """
+        Test that blending with reduced precision colors is close to the full
+        precision result.
+        """
+        torch.manual_seed(231)
+        N, S, K = 2, 8, 5
+        F = 32  # number of faces in the mesh
+        device = torch.device("cuda:0")
+        pix_to_face = torch.randint(low=-1, high=F, size=(N, S, S, K), device=device)
+        dists = torch.randn(size=(N, S, S, K), device=device) * 1e-2
+        zbuf = torch.rand(size=(N, S, S, K), device=device) * 5 + 1.0
+        colors = torch.rand((N, S, S, K, 3), device=device)
+        fragments = Fragments(
+            pix_to_face=pix_to_face,
+            bary_coords=torch.tensor([], device=device),  # dummy
+            zbuf=zbuf,
+            dists=dists,
+        )
+        blend_params = BlendParams(sigma=1e-2, gamma=1e-1)
+        blend_params_half = BlendParams(sigma=1e-2, gamma=1e-1, dtype=torch.float16)
+        out = softmax_rgb_blend(colors, fragments, blend_params)
+        out_half = softmax_rgb_blend(colors, fragments, blend_params_half)
+        self.assertEqual(out_half.dtype, torch.float32)
+        self.assertClose(out_half, out, atol=5e-3)
+
+    def test_blend_zero_sigma(self):
+        """
+        Test the sigma = 0 fast paths against a vanishingly small sigma, both for
+        faces which contain the pixel centers and for faces which are only
+        within the blur radius.
+        """
+        torch.manual_seed(231)
+        N, S = 2, 8
+        F = 32  # number of faces in the mesh
+        device = torch.device("cpu")
+        blend_params = BlendParams(sigma=0.0, gamma=1e-1)
+        blend_params_ref = BlendParams(sigma=1e-8, gamma=1e-1)
+        # The softmax fast path is only used for K = 1.
+        for K, blend_fns in (
+            (1, (sigmoid_alpha_blend, softmax_rgb_blend)),
+            (3, (sigmoid_alpha_blend,)),
+        ):
+            size = (N, S, S, K)
+            pix_to_face = torch.randint(low=-1, high=F, size=size, device=device)
+            # Negative distances are inside the face, positive ones are outside.
+            sign = torch.randint(low=0, high=2, size=size, device=device) * 2 - 1
+            dists = sign * (torch.rand(size=size, device=device) * 1e-2 + 1e-3)
+            zbuf = torch.rand(size=size, device=device) * 5 + 1.0
+            colors = torch.rand((N, S, S, K, 3), device=device)
+            fragments = Fragments(
+                pix_to_face=pix_to_face,
+                bary_coords=torch.tensor([], device=device),  # dummy
+                zbuf=zbuf,
+                dists=dists,
+            )
+            for blend_fn in blend_fns:
+                out = blend_fn(colors, fragments, blend_params)
+                out_ref = blend_fn(colors, fragments, blend_params_ref)
+                self.assertClose(out, out_ref, atol=1e-6)
+
+    def test_softmax_blend_core_gradients(self):
+        """
+        Test the gradients of the PyTorch implementation, which computes the
+        alpha as a sum of log1p terms, against the naive cumulative product.
+        """
+        torch.manual_seed(231)
+        N, S, K = 1, 4, 3
+        F = 32  # number of faces in the mesh
+        device = torch.device("cpu")
+        pix_to_face = torch.randint(low=-1, high=F, size=(N, S, S, K), device=device)
+        # Include faces which fully cover pixels, i.e. prob == 1.0.
+        dists1 = torch.randn(size=(N, S, S, K), device=device) * 1e-2
+        dists1[0, 0, 0, 0] = -1.0
+        dists2 = dists1.clone()
+        dists1.requires_grad = True
+        dists2.requires_grad = True
+        zbuf = torch.rand(size=(N, S, S, K), device=device) * 5 + 1.0
+        colors = torch.rand((N, S, S, K, 3), device=device)
+        blend_params = BlendParams(sigma=1e-2, gamma=1e-1)
+        fragments = Fragments(
+            pix_to_face=pix_to_face,
+            bary_coords=torch.tensor([], device=device),  # dummy
+            zbuf=zbuf,
+            dists=dists2,
+        )
+        args1 = (
+            colors,
+            dists1,
+            zbuf,
+            pix_to_face >= 0,
+            torch.tensor(blend_params.background_color, device=device),
+            blend_params.sigma,
+            blend_params.gamma,
+            torch.tensor(1.0, device=device),
+            torch.tensor(100.0, device=device),
+        )
+        args2 = (colors, fragments, blend_params)
+        self._compare_impls(
+            _softmax_blend_core,
+            softmax_blend_naive,
+            args1,
+            args2,
+            dists1,
+            dists2,
+            compare_grads=True,
+        )
+
+    def test_softmax_rgb_blend_custom_cpu(self):
+        self._test_softmax_rgb_blend_custom(torch.device("cpu"))
+
+    def test_softmax_rgb_blend_custom_cuda(self):
+        self._test_softmax_rgb_blend_custom(torch.device("cuda:0"))
+
     @staticmethod
     def bm_sigmoid_alpha_blending(
         num_meshes: int = 16,
@@ -416,3 +631,19 @@ class TestBlending(TestCaseMixin, unittest.TestCase):
         bp_new = BlendParams(background_color=(0.5, 0.5, 0.5))
         self.assertEqual(bp_new.background_color, (0.5, 0.5, 0.5))
         self.assertEqual(bp_default.background_color, (1.0, 1.0, 1.0))
+
+    def test_background_color_tensor(self):
+        """
+        Test that sequence background colors are converted to a tensor once and
+        reused, and that tensor background colors are used as is.
+        """
+        colors = torch.rand((1, 2, 2, 1, 3))
+        blend_params = BlendParams(background_color=(0.1, 0.2, 0.3))
+        background1 = _background_color_tensor(blend_params, colors)
+        background2 = _background_color_tensor(blend_params, colors)
+        self.assertClose(background1, torch.tensor([0.1, 0.2, 0.3]))
+        self.assertIs(background1, background2)
+
+        background = torch.tensor([0.4, 0.5, 0.6])
+        blend_params = BlendParams(background_color=background)
+        self.assertIs(_background_color_tensor(blend_params, colors), background)
@@ -1,8 +1,11 @@
 # Copyright (c) Facebook, Inc. and its affiliates. All rights reserved.
 import os
 import unittest
-from collections import Counter
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import Dict, List
 
 
 # This file groups together tests which look at the code without running it.
@@ -18,10 +21,11 @@ class TestBuild(unittest.TestCase):
         test_dir = Path(__file__).resolve().parent
         source_dir = test_dir.parent / "pytorch3d"
 
+        files_by_suffix = _files_by_suffix()
         stems = []
         for extension in [".cu", ".cpp"]:
-            files = source_dir.glob(f"**/*{extension}")
-            stems.extend(f.stem for f in files)
+            files = files_by_suffix[extension]
+            stems.extend(f.stem for f in files if source_dir in f.parents)
 
         counter = Counter(stems)
         for k, v in counter.items():
@@ -29,28 +33,45 @@ class TestBuild(unittest.TestCase):
 
     @unittest.skipIf(in_conda_build, "In conda build")
     def test_copyright(self):
-        test_dir = Path(__file__).resolve().parent
-        root_dir = test_dir.parent
-
-        extensions = ("py", "cu", "cuh", "cpp", "h", "hpp", "sh")
-
-        expect = (
-            "Copyright (c) Facebook, Inc. and its affiliates."
-            + " All rights reserved.\n"
-        )
-
-        for extension in extensions:
-            for i in root_dir.glob(f"**/*.{extension}"):
-                if str(i).endswith(
-                    "pytorch3d/transforms/external/kornia_angle_axis_to_rotation_matrix.py"
-                ):
-                    continue
-                if str(i).endswith("pytorch3d/csrc/pulsar/include/fastermath.h"):
-                    continue
-                with open(i) as f:
-                    firstline = f.readline()
-                    if firstline.startswith(("# -*-", "#!")):
-                        firstline = f.readline()
-                    self.assertTrue(
-                        firstline.endswith(expect), f"{i} missing copyright header."
-                    )
+        extensions = (".py", ".cu", ".cuh", ".cpp", ".h", ".hpp", ".sh")
+
+        # The files are read in parallel as this is dominated by I/O.
+        files_by_suffix = _files_by_suffix()
+        paths = [i for extension in extensions for i in files_by_suffix[extension]]
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(_has_copyright, paths))
+
+        for i, has_copyright in zip(paths, results):
+            self.assertTrue(has_copyright, f"{i} missing copyright header.")
+
+
+@lru_cache(maxsize=None)
+def _files_by_suffix() -> Dict[str, List[Path]]:
+    """
+    Walk the repository once and bucket the files by suffix. The result is
+    shared by the tests in this file.
+    """
+    test_dir = Path(__file__).resolve().parent
+    root_dir = test_dir.parent
+    files_by_suffix = defaultdict(list)
+    for i in root_dir.rglob("*"):
+        files_by_suffix[i.suffix].append(i)
+    return files_by_suffix
+
+
+def _has_copyright(path) -> bool:
+    if str(path).endswith(
+        "pytorch3d/transforms/external/kornia_angle_axis_to_rotation_matrix.py"
+    ):
+        return True
+    if str(path).endswith("pytorch3d/csrc/pulsar/include/fastermath.h"):
+        return True
+
+    expect = (
+        "Copyright (c) Facebook, Inc. and its affiliates." + " All rights reserved.\n"
+    )
+    with open(path) as f:
+        firstline = f.readline()
+        if firstline.startswith(("# -*-", "#!")):
+            firstline = f.readline()
+        return firstline.endswith(expect)
@@ -135,6 +135,56 @@ class TestAccumulatePoints(TestCaseMixin, unittest.TestCase):
         )
         self._python_vs_cpu_vs_cuda(self.accumulate_weightedsum_python, weighted_sum)
 
+    def test_background_color(self):
+        for device in [torch.device("cpu"), get_random_cuda_device()]:
+            self._background_color(alpha_composite, device)
+            self._background_color(norm_weighted_sum, device)
+
+    def _background_color(self, accumulate_func, device):
+        torch.manual_seed(231)
+        C, P, K, H, W = 4, 100, 3, 16, 16
+        features = torch.rand((C, P), device=device)
+        alphas = torch.rand((1, K, H, W), device=device)
+        points_idx = torch.randint(-1, P, (1, K, H, W), device=device)
+        background_color = torch.rand((C,), device=device, requires_grad=True)
+
+        result = accumulate_func(points_idx, alphas, features, background_color)
+
+        # Fill the pixels without points after compositing.
+        expected = accumulate_func(points_idx, alphas, features)
+        background_mask = points_idx[:, 0] < 0
+        expected = torch.where(
+            background_mask[:, None], background_color.view(1, C, 1, 1), expected
+        )
+        self.assertClose(result, expected)
+
+        # The background color receives the gradients of the pixels without points.
+        grad_result = torch.rand_like(result)
+        (grad_background,) = torch.autograd.grad(
+            (result * grad_result).sum(), background_color
+        )
+        (grad_expected,) = torch.autograd.grad(
+            (expected * grad_result).sum(), background_color
+        )
+        self.assertClose(grad_background, grad_expected)
+
+        # The pixels with no nearest point only depend on the background color,
+        # even if later points are valid.
+        points_idx[:, 1:] = points_idx[:, 1:].clamp(min=0)
+        features.requires_grad = True
+        alphas.requires_grad = True
+        result = accumulate_func(points_idx, alphas, features, background_color)
+        background_mask = (points_idx[:, :1] < 0).to(result.dtype)
+        grad_features, grad_alphas = torch.autograd.grad(
+            (result * background_mask).sum(), (features, alphas)
+        )
+        self.assertClose(grad_features, torch.zeros_like(features))
+        self.assertClose(grad_alphas, torch.zeros_like(alphas))
+
+        # The background color needs one value per feature channel.
+        with self.assertRaisesRegex(RuntimeError, "background_color"):
+            accumulate_func(points_idx, alphas, features, background_color[:3])
+
     def _python_vs_cpu_vs_cuda(self, accumulate_func_python, accumulate_func):
         torch.manual_seed(231)
         device = torch.device("cpu")
@@ -130,6 +130,45 @@ class TestMeshRasterizer(unittest.TestCase):
 
         self.assertTrue(torch.allclose(image, image_ref))
 
+    def test_camera_transform_cache(self):
+        sphere_mesh = ico_sphere(2)
+        R, T = look_at_view_transform(2.7, 0, 0)
+        cameras = FoVPerspectiveCameras(R=R, T=T)
+        rasterizer = MeshRasterizer(cameras=cameras)
+
+        verts1 = rasterizer.transform(sphere_mesh).verts_padded()
+        proj = rasterizer._cached_proj
+        world_to_view = rasterizer._cached_world_to_view
+
+        # The transforms are reused if the cameras are unchanged.
+        verts2 = rasterizer.transform(sphere_mesh).verts_padded()
+        self.assertIs(rasterizer._cached_proj, proj)
+        self.assertIs(rasterizer._cached_world_to_view, world_to_view)
+        self.assertTrue(torch.allclose(verts1, verts2))
+
+        # An in place update of the cameras invalidates the cache.
+        cameras.T[:, 2] = 2.0
+        verts3 = rasterizer.transform(sphere_mesh).verts_padded()
+        self.assertIsNot(rasterizer._cached_world_to_view, world_to_view)
+        R, T = look_at_view_transform(2.0, 0, 0)
+        cameras2 = FoVPerspectiveCameras(R=R, T=T)
+        verts4 = MeshRasterizer(cameras=cameras2).transform(sphere_mesh).verts_padded()
+        self.assertTrue(torch.allclose(verts3, verts4))
+
+        # Camera parameters passed as kwargs are not cached.
+        rasterizer.invalidate_cache()
+        rasterizer.transform(sphere_mesh, R=R, T=T)
+        self.assertIsNone(rasterizer._cached_proj)
+
+        # Cameras passed at forward time are cached like the default cameras.
+        verts5 = rasterizer.transform(sphere_mesh, cameras=cameras2).verts_padded()
+        proj = rasterizer._cached_proj
+        self.assertIsNotNone(proj)
+        self.assertTrue(torch.allclose(verts5, verts4))
+        verts6 = rasterizer.transform(sphere_mesh, cameras=cameras2).verts_padded()
+        self.assertIs(rasterizer._cached_proj, proj)
+        self.assertTrue(torch.allclose(verts6, verts4))
+
 
 class TestPointRasterizer(unittest.TestCase):
     def test_simple_sphere(self):
@@ -47,27 +47,211 @@ from pytorch3d.utils.torus import torus
 # All saved images have prefix DEBUG_
 DEBUG = False
 DATA_DIR = Path(__file__).resolve().parent / "data"
+# The device all the tests render on. The cached meshes, references and
+# renderers are keyed by device, so they are shared by every test.
+DEVICE = torch.device("cuda:0")
+TUTORIAL_DATA_DIR = Path(__file__).resolve().parent.parent / "docs/tutorials/data"
+COW_OBJ = TUTORIAL_DATA_DIR / "cow_mesh/cow.obj"
+
+
+def _bin_sizes():
+    """
+    Rasterization bin sizes to compare against the reference images. The naive
+    rasterizer (bin_size=0) only duplicates the coarse-to-fine output and is
+    slow for large faces_per_pixel, so it is only run if P3D_SLOW_TESTS is set.
+    """
+    if os.environ.get("P3D_SLOW_TESTS"):
+        return [0, None]
+    return [None]
+
+
+def _to_uint8_image(image: torch.Tensor) -> np.ndarray:
+    """
+    Convert a float image in [0, 1] to a uint8 array for saving DEBUG images.
+    The conversion runs on the device of image, so only uint8 data is copied
+    to the host.
+    """
+    return image.mul(255).clamp_(0, 255).to(torch.uint8).cpu().numpy()
+
+
+def _save_join_debug_images(renderer, output, meshes, prefix: str) -> None:
+    """
+    Save the render of a joined scene and renders of each of the meshes that
+    were joined into it, for debugging the join tests. The extra renders are
+    only done here, so callers should only call this if DEBUG is set.
+    """
+    Image.fromarray(_to_uint8_image(output[0, ..., :3])).save(
+        DATA_DIR / ("%s_final_.png" % prefix)
+    )
+    for i, mesh in enumerate(meshes, 1):
+        image = renderer(mesh)[0, ..., :3]
+        filename = "%s_%d.png" % (prefix, i)
+        Image.fromarray(_to_uint8_image(image)).save(DATA_DIR / filename)
 
 
 class TestRenderMeshes(TestCaseMixin, unittest.TestCase):
-    def test_simple_sphere(self, elevated_camera=False, check_depth=False):
+    @classmethod
+    def setUpClass(cls):
+        # Decoded reference images, shared by the tests which compare against
+        # the same files.
+        cls._ref_cache = {}
+        # Level 5 ico spheres shared by the sphere tests, keyed by device.
+        cls._ico_sphere_cache = {}
+        # Parsed cow meshes, keyed by device.
+        cls._cow_cache = {}
+        # Renderers shared by the join tests, keyed by device and image size.
+        cls._renderer_cache = {}
+
+    def _load_ref_image(self, filename: str, device=None) -> torch.Tensor:
+        """
+        Load a reference image from DATA_DIR, decoding each file only once and
+        copying it to each device only once. The returned tensor is shared and
+        must not be modified in place.
+        """
+        if filename not in self._ref_cache:
+            self._ref_cache[filename] = load_rgb_image(filename, DATA_DIR)
+        if device is None:
+            return self._ref_cache[filename]
+        key = (filename, str(device))
+        if key not in self._ref_cache:
+            self._ref_cache[key] = self._ref_cache[filename].to(device)
+        return self._ref_cache[key]
+
+    def _load_ref_silhouette(self, filename: str, device) -> torch.Tensor:
+        """
+        Load a single channel reference silhouette from DATA_DIR as a float
+        image in [0, 1] on device, decoding each file only once. The returned
+        tensor is shared and must not be modified in place.
+        """
+        key = ("silhouette", filename, str(device))
+        if key not in self._ref_cache:
+            with Image.open(DATA_DIR / filename) as raw_image:
+                image = torch.from_numpy(np.array(raw_image))
+            # Copy the uint8 image and convert it on the device.
+            image = image.to(device).to(dtype=torch.float32) / 255.0
+            self._ref_cache[key] = image
+        return self._ref_cache[key]
+
+    def _ico_sphere(self, device) -> Meshes:
+        """
+        Return a level 5 ico sphere on device, subdividing the icosahedron only
+        once per device. The returned mesh is shared, so tests which modify its
+        tensors (e.g. setting requires_grad) must clone it first.
+        """
+        key = str(device)
+        if key not in self._ico_sphere_cache:
+            self._ico_sphere_cache[key] = ico_sphere(5, device)
+        return self._ico_sphere_cache[key]
+
+    def _white_ico_sphere(self, device) -> Meshes:
+        """
+        Return the shared level 5 ico sphere with white vertex textures. The
+        mesh is built once per device and shares its verts and faces with
+        _ico_sphere, so it must not be modified in place either.
+        """
+        key = (str(device), "white")
+        if key not in self._ico_sphere_cache:
+            sphere_mesh = self._ico_sphere(device)
+            self._ico_sphere_cache[key] = Meshes(
+                verts=sphere_mesh.verts_list(),
+                faces=sphere_mesh.faces_list(),
+                textures=self._white_textures(sphere_mesh.verts_padded()),
+            )
+        return self._ico_sphere_cache[key]
+
+    @staticmethod
+    def _white_textures(verts_padded) -> TexturesVertex:
+        """
+        White vertex textures for verts_padded. TexturesVertex only reads the
+        features, so an expanded view of a single one avoids allocating an
+        (N, V, 3) tensor of ones.
+        """
+        feats = torch.ones((1, 1, 1), device=verts_padded.device)
+        return TexturesVertex(verts_features=feats.expand_as(verts_padded))
+
+    def _load_cow(self, device):
+        """
+        Load the cow mesh with load_obj, parsing the file only once per device.
+        The texture map and the texture atlas tests use the same load, so aux
+        contains both the texture images and uvs and the (8, 8) texture atlas.
+        The returned tensors are shared and must not be modified in place.
+        """
+        key = str(device)
+        if key not in self._cow_cache:
+            self._cow_cache[key] = load_obj(
+                COW_OBJ,
+                device=device,
+                load_textures=True,
+                create_texture_atlas=True,
+                texture_atlas_size=8,
+                texture_wrap=None,
+            )
+        return self._cow_cache[key]
+
+    def _ambient_renderer(self, device, image_size: int) -> MeshRenderer:
+        """
+        Return a renderer with ambient only white lighting and a white
+        background, looking at the origin from a distance of 18. The renderer
+        is built once for each device and image size and is shared, so tests
+        must pass any changes to it as kwargs rather than modifying it.
+        """
+        key = (str(device), image_size)
+        if key not in self._renderer_cache:
+            R, T = look_at_view_transform(18, 0, 0)
+            cameras = FoVPerspectiveCameras(device=device, R=R, T=T)
+
+            # The join tests render a few small tori, so no bin can hold more
+            # than a few hundred faces and the default bin buffer of 10000
+            # faces per bin is far larger than needed.
+            raster_settings = RasterizationSettings(
+                image_size=image_size,
+                blur_radius=0.0,
+                faces_per_pixel=1,
+                bin_size=None,
+                max_faces_per_bin=1000,
+            )
+
+            lights = PointLights(
+                device=device,
+                ambient_color=((1.0, 1.0, 1.0),),
+                diffuse_color=((0.0, 0.0, 0.0),),
+                specular_color=((0.0, 0.0, 0.0),),
+            )
+            blend_params = BlendParams(
+                sigma=1e-1,
+                gamma=1e-4,
+                background_color=torch.tensor([1.0, 1.0, 1.0], device=device),
+            )
+            self._renderer_cache[key] = MeshRenderer(
+                rasterizer=MeshRasterizer(
+                    cameras=cameras, raster_settings=raster_settings
+                ),
+                shader=HardPhongShader(
+                    device=device,
+                    blend_params=blend_params,
+                    cameras=cameras,
+                    lights=lights,
+                ),
+            )
+        return self._renderer_cache[key]
+
+    @torch.no_grad()
+    def _check_simple_sphere(self, cam_type, elevated_camera=False, check_depth=False):
         """
         Test output of phong and gouraud shading matches a reference image using
         the default values for the light sources.
 
         Args:
+            cam_type: The cameras class used to observe the scene.
             elevated_camera: Defines whether the camera observing the scene should
                            have an elevation of 45 degrees.
+            check_depth: Defines whether the depth of the rendered fragments is
+                           compared to the depth from the rasterizer alone.
         """
-        device = torch.device("cuda:0")
+        device = DEVICE
 
         # Init mesh
-        sphere_mesh = ico_sphere(5, device)
-        verts_padded = sphere_mesh.verts_padded()
-        faces_padded = sphere_mesh.faces_padded()
-        feats = torch.ones_like(verts_padded, device=device)
-        textures = TexturesVertex(verts_features=feats)
-        sphere_mesh = Meshes(verts=verts_padded, faces=faces_padded, textures=textures)
+        sphere_mesh = self._white_ico_sphere(device)
 
         # Init rasterizer settings
         if elevated_camera:
@@ -80,140 +264,100 @@ class TestRenderMeshes(TestCaseMixin, unittest.TestCase):
             # No elevation or azimuth rotation
             R, T = look_at_view_transform(2.7, 0.0, 0.0)
             postfix = "_"
-        for cam_type in (
-            FoVPerspectiveCameras,
-            FoVOrthographicCameras,
-            PerspectiveCameras,
-            OrthographicCameras,
-        ):
-            cameras = cam_type(device=device, R=R, T=T)
+        cameras = cam_type(device=device, R=R, T=T)
 
-            # Init shader settings
-            materials = Materials(device=device)
-            lights = PointLights(device=device)
-            lights.location = torch.tensor([0.0, 0.0, +2.0], device=device)[None]
+        # Init shader settings
+        materials = Materials(device=device)
+        lights = PointLights(device=device)
+        lights.location = torch.tensor([0.0, 0.0, +2.0], device=device)[None]
 
-            raster_settings = RasterizationSettings(
-                image_size=512, blur_radius=0.0, faces_per_pixel=1
-            )
-            rasterizer = MeshRasterizer(
-                cameras=cameras, raster_settings=raster_settings
-            )
-            blend_params = BlendParams(1e-4, 1e-4, (0, 0, 0))
+        raster_settings = RasterizationSettings(
+            image_size=512, blur_radius=0.0, faces_per_pixel=1
+        )
+        rasterizer = MeshRasterizer(cameras=cameras, raster_settings=raster_settings)
+        blend_params = BlendParams(1e-4, 1e-4, (0, 0, 0))
 
-            # Test several shaders
-            shaders = {
-                "phong": HardPhongShader,
-                "gouraud": HardGouraudShader,
-                "flat": HardFlatShader,
-            }
-            for (name, shader_init) in shaders.items():
-                shader = shader_init(
+        # Test several shaders
+        shaders = {
+            "phong": HardPhongShader,
+            "gouraud": HardGouraudShader,
+            "flat": HardFlatShader,
+        }
+        renderer_init = MeshRendererWithFragments if check_depth else MeshRenderer
+        renderers = {
+            name: renderer_init(
+                rasterizer=rasterizer,
+                shader=shader_init(
                     lights=lights,
                     cameras=cameras,
                     materials=materials,
                     blend_params=blend_params,
-                )
-                if check_depth:
-                    renderer = MeshRendererWithFragments(
-                        rasterizer=rasterizer, shader=shader
-                    )
-                    images, fragments = renderer(sphere_mesh)
-                    self.assertClose(fragments.zbuf, rasterizer(sphere_mesh).zbuf)
-                else:
-                    renderer = MeshRenderer(rasterizer=rasterizer, shader=shader)
-                    images = renderer(sphere_mesh)
-
-                rgb = images[0, ..., :3].squeeze().cpu()
-                filename = "simple_sphere_light_%s%s%s.png" % (
-                    name,
-                    postfix,
-                    cam_type.__name__,
-                )
-
-                image_ref = load_rgb_image("test_%s" % filename, DATA_DIR)
-                self.assertClose(rgb, image_ref, atol=0.05)
-
-                if DEBUG:
-                    filename = "DEBUG_%s" % filename
-                    Image.fromarray((rgb.numpy() * 255).astype(np.uint8)).save(
-                        DATA_DIR / filename
-                    )
-
-            ########################################################
-            # Move the light to the +z axis in world space so it is
-            # behind the sphere. Note that +Z is in, +Y up,
-            # +X left for both world and camera space.
-            ########################################################
-            lights.location[..., 2] = -2.0
-            phong_shader = HardPhongShader(
-                lights=lights,
-                cameras=cameras,
-                materials=materials,
-                blend_params=blend_params,
+                ),
             )
+            for (name, shader_init) in shaders.items()
+        }
+        if check_depth:
+            # The reference depth only depends on the cameras.
+            zbuf_ref = rasterizer(sphere_mesh).zbuf
+
+        for (name, renderer) in renderers.items():
             if check_depth:
-                phong_renderer = MeshRendererWithFragments(
-                    rasterizer=rasterizer, shader=phong_shader
-                )
-                images, fragments = phong_renderer(sphere_mesh, lights=lights)
-                self.assertClose(
-                    fragments.zbuf, rasterizer(sphere_mesh, lights=lights).zbuf
-                )
+                images, fragments = renderer(sphere_mesh)
+                self.assertClose(fragments.zbuf, zbuf_ref)
             else:
-                phong_renderer = MeshRenderer(
-                    rasterizer=rasterizer, shader=phong_shader
-                )
-                images = phong_renderer(sphere_mesh, lights=lights)
-            rgb = images[0, ..., :3].squeeze().cpu()
-            if DEBUG:
-                filename = "DEBUG_simple_sphere_dark%s%s.png" % (
-                    postfix,
-                    cam_type.__name__,
-                )
-                Image.fromarray((rgb.numpy() * 255).astype(np.uint8)).save(
-                    DATA_DIR / filename
-                )
+                images = renderer(sphere_mesh)
 
-            image_ref_phong_dark = load_rgb_image(
-                "test_simple_sphere_dark%s%s.png" % (postfix, cam_type.__name__),
-                DATA_DIR,
+            rgb = images[0, ..., :3].squeeze()
+            filename = "simple_sphere_light_%s%s%s.png" % (
+                name,
+                postfix,
+                cam_type.__name__,
             )
-            self.assertClose(rgb, image_ref_phong_dark, atol=0.05)
-
-    def test_simple_sphere_elevated_camera(self):
-        """
-        Test output of phong and gouraud shading matches a reference image using
-        the default values for the light sources.
 
-        The rendering is performed with a camera that has non-zero elevation.
-        """
-        self.test_simple_sphere(elevated_camera=True)
+            image_ref = self._load_ref_image("test_%s" % filename, device)
+            self.assertClose(rgb, image_ref, atol=0.05)
 
-    def test_simple_sphere_depth(self):
-        """
-        Test output of phong and gouraud shading matches a reference image using
-        the default values for the light sources.
+            if DEBUG:
+                filename = "DEBUG_%s" % filename
+                Image.fromarray(_to_uint8_image(rgb)).save(DATA_DIR / filename)
+
+        ########################################################
+        # Move the light to the +z axis in world space so it is
+        # behind the sphere. Note that +Z is in, +Y up,
+        # +X left for both world and camera space.
+        ########################################################
+        lights.location[..., 2] = -2.0
+        phong_renderer = renderers["phong"]
+        if check_depth:
+            images, fragments = phong_renderer(sphere_mesh, lights=lights)
+            self.assertClose(fragments.zbuf, zbuf_ref)
+        else:
+            images = phong_renderer(sphere_mesh, lights=lights)
+        rgb = images[0, ..., :3].squeeze()
+        if DEBUG:
+            filename = "DEBUG_simple_sphere_dark%s%s.png" % (
+                postfix,
+                cam_type.__name__,
+            )
+            Image.fromarray(_to_uint8_image(rgb)).save(DATA_DIR / filename)
 
-        The rendering is performed with a camera that has non-zero elevation.
-        """
-        self.test_simple_sphere(check_depth=True)
+        image_ref_phong_dark = self._load_ref_image(
+            "test_simple_sphere_dark%s%s.png" % (postfix, cam_type.__name__),
+            device,
+        )
+        self.assertClose(rgb, image_ref_phong_dark, atol=0.05)
 
+    @torch.no_grad()
     def test_simple_sphere_screen(self):
 
         """
         Test output when rendering with PerspectiveCameras & OrthographicCameras
         in NDC vs screen space.
         """
-        device = torch.device("cuda:0")
+        device = DEVICE
 
         # Init mesh
-        sphere_mesh = ico_sphere(5, device)
-        verts_padded = sphere_mesh.verts_padded()
-        faces_padded = sphere_mesh.faces_padded()
-        feats = torch.ones_like(verts_padded, device=device)
-        textures = TexturesVertex(verts_features=feats)
-        sphere_mesh = Meshes(verts=verts_padded, faces=faces_padded, textures=textures)
+        sphere_mesh = self._white_ico_sphere(device)
 
         R, T = look_at_view_transform(2.7, 0.0, 0.0)
 
@@ -247,29 +391,23 @@ class TestRenderMeshes(TestCaseMixin, unittest.TestCase):
             )
             renderer = MeshRenderer(rasterizer=rasterizer, shader=shader)
             images = renderer(sphere_mesh)
-            rgb = images[0, ..., :3].squeeze().cpu()
+            rgb = images[0, ..., :3].squeeze()
             filename = "test_simple_sphere_light_phong_%s.png" % cam_type.__name__
 
-            image_ref = load_rgb_image(filename, DATA_DIR)
+            image_ref = self._load_ref_image(filename, device)
             self.assertClose(rgb, image_ref, atol=0.05)
 
+    @torch.no_grad()
     def test_simple_sphere_batched(self):
         """
         Test a mesh with vertex textures can be extended to form a batch, and
         is rendered correctly with Phong, Gouraud and Flat Shaders.
         """
         batch_size = 5
-        device = torch.device("cuda:0")
+        device = DEVICE
 
         # Init mesh with vertex textures.
-        sphere_meshes = ico_sphere(5, device).extend(batch_size)
-        verts_padded = sphere_meshes.verts_padded()
-        faces_padded = sphere_meshes.faces_padded()
-        feats = torch.ones_like(verts_padded, device=device)
-        textures = TexturesVertex(verts_features=feats)
-        sphere_meshes = Meshes(
-            verts=verts_padded, faces=faces_padded, textures=textures
-        )
+        sphere_meshes = self._white_ico_sphere(device).extend(batch_size)
 
         # Init rasterizer settings
         dist = torch.tensor([2.7]).repeat(batch_size).to(device)
@@ -294,6 +432,9 @@ class TestRenderMeshes(TestCaseMixin, unittest.TestCase):
             "gouraud": HardGouraudShader,
             "flat": HardFlatShader,
         }
+        # The shaders only differ in how they shade the same fragments, so
+        # the batch is rasterized once and shaded with each of them.
+        fragments = rasterizer(sphere_meshes)
         for (name, shader_init) in shaders.items():
             shader = shader_init(
                 lights=lights,
@@ -301,30 +442,27 @@ class TestRenderMeshes(TestCaseMixin, unittest.TestCase):
                 materials=materials,
                 blend_params=blend_params,
             )
-            renderer = MeshRenderer(rasterizer=rasterizer, shader=shader)
-            images = renderer(sphere_meshes)
-            image_ref = load_rgb_image(
+            images = shader(fragments, sphere_meshes)
+            image_ref = self._load_ref_image(
                 "test_simple_sphere_light_%s_%s.png" % (name, type(cameras).__name__),
-                DATA_DIR,
+                device,
             )
             for i in range(batch_size):
-                rgb = images[i, ..., :3].squeeze().cpu()
+                rgb = images[i, ..., :3].squeeze()
                 if i == 0 and DEBUG:
                     filename = "DEBUG_simple_sphere_batched_%s_%s.png" % (
                         name,
                         type(cameras).__name__,
                     )
-                    Image.fromarray((rgb.numpy() * 255).astype(np.uint8)).save(
-                        DATA_DIR / filename
-                    )
+                    Image.fromarray(_to_uint8_image(rgb)).save(DATA_DIR / filename)
                 self.assertClose(rgb, image_ref, atol=0.05)
 
     def test_silhouette_with_grad(self):
         """
         Test silhouette blending. Also check that gradient calculation works.
         """
-        device = torch.device("cuda:0")
-        sphere_mesh = ico_sphere(5, device)
+        device = DEVICE
+        sphere_mesh = self._ico_sphere(device)
         verts, faces = sphere_mesh.get_mesh_verts_faces(0)
         sphere_mesh = Meshes(verts=[verts], faces=[faces])
 
@@ -335,6 +473,14 @@ class TestRenderMeshes(TestCaseMixin, unittest.TestCase):
             faces_per_pixel=80,
             clip_barycentric_coords=True,
         )
+        # The gradient check only tests that a gradient exists, which does
+        # not depend on the resolution, so it uses a much cheaper render.
+        grad_raster_settings = RasterizationSettings(
+            image_size=128,
+            blur_radius=raster_settings.blur_radius,
+            faces_per_pixel=20,
+            clip_barycentric_coords=True,
+        )
 
         # Init rasterizer settings
         R, T = look_at_view_transform(2.7, 0, 0)
@@ -353,44 +499,41 @@ class TestRenderMeshes(TestCaseMixin, unittest.TestCase):
                 ),
                 shader=SoftSilhouetteShader(blend_params=blend_params),
             )
-            images = renderer(sphere_mesh)
-            alpha = images[0, ..., 3].squeeze().cpu()
+            with torch.no_grad():
+                images = renderer(sphere_mesh)
+            alpha = images[0, ..., 3].squeeze()
             if DEBUG:
                 filename = os.path.join(
                     DATA_DIR, "DEBUG_%s_silhouette.png" % (cam_type.__name__)
                 )
-                Image.fromarray((alpha.detach().numpy() * 255).astype(np.uint8)).save(
-                    filename
-                )
+                Image.fromarray(_to_uint8_image(alpha)).save(filename)
 
             ref_filename = "test_%s_silhouette.png" % (cam_type.__name__)
-            image_ref_filename = DATA_DIR / ref_filename
-            with Image.open(image_ref_filename) as raw_image_ref:
-                image_ref = torch.from_numpy(np.array(raw_image_ref))
-
-            image_ref = image_ref.to(dtype=torch.float32) / 255.0
+            image_ref = self._load_ref_silhouette(ref_filename, device)
             self.assertClose(alpha, image_ref, atol=0.055)
 
-            # Check grad exist
-            verts.requires_grad = True
-            sphere_mesh = Meshes(verts=[verts], faces=[faces])
-            images = renderer(sphere_mesh)
+            # Check grad exist. The verts are detached so that the verts of
+            # sphere_mesh do not require grad in the following iterations.
+            grad_verts = verts.detach().requires_grad_(True)
+            grad_renderer = MeshRenderer(
+                rasterizer=MeshRasterizer(
+                    cameras=cameras, raster_settings=grad_raster_settings
+                ),
+                shader=SoftSilhouetteShader(blend_params=blend_params),
+            )
+            images = grad_renderer(Meshes(verts=[grad_verts], faces=[faces]))
             images[0, ...].sum().backward()
-            self.assertIsNotNone(verts.grad)
+            self.assertIsNotNone(grad_verts.grad)
 
     def test_texture_map(self):
         """
         Test a mesh with a texture map is loaded and rendered correctly.
         The pupils in the eyes of the cow should always be looking to the left.
         """
-        device = torch.device("cuda:0")
-        obj_dir = Path(__file__).resolve().parent.parent / "docs/tutorials/data"
-        obj_filename = obj_dir / "cow_mesh/cow.obj"
+        device = DEVICE
 
         # Load mesh + texture
-        verts, faces, aux = load_obj(
-            obj_filename, device=device, load_textures=True, texture_wrap=None
-        )
+        verts, faces, aux = self._load_cow(device)
         tex_map = list(aux.texture_images.values())[0]
         tex_map = tex_map[None, ...].to(faces.textures_idx.device)
         textures = TexturesUV(
@@ -431,28 +574,30 @@ class TestRenderMeshes(TestCaseMixin, unittest.TestCase):
         )
 
         # Load reference image
-        image_ref = load_rgb_image("test_texture_map_back.png", DATA_DIR)
+        image_ref = self._load_ref_image("test_texture_map_back.png", device)
 
-        for bin_size in [0, None]:
+        for bin_size in _bin_sizes():
             # Check both naive and coarse to fine produce the same output.
             renderer.rasterizer.raster_settings.bin_size = bin_size
-            images = renderer(mesh)
-            rgb = images[0, ..., :3].squeeze().cpu()
+            with torch.no_grad():
+                images = renderer(mesh)
+            rgb = images[0, ..., :3].squeeze()
 
             if DEBUG:
-                Image.fromarray((rgb.numpy() * 255).astype(np.uint8)).save(
+                Image.fromarray(_to_uint8_image(rgb)).save(
                     DATA_DIR / "DEBUG_texture_map_back.png"
                 )
 
             # NOTE some pixels can be flaky and will not lead to
-            # `cond1` being true. Add `cond2` and check `cond1 or cond2`
+            # `cond1` being true. Add `cond2` and check `cond1 or cond2`.
+            # Both are computed on the GPU, only the results are synced.
             cond1 = torch.allclose(rgb, image_ref, atol=0.05)
             cond2 = ((rgb - image_ref).abs() > 0.05).sum() < 5
             self.assertTrue(cond1 or cond2)
 
-        # Check grad exists
-        [verts] = mesh.verts_list()
-        verts.requires_grad = True
+        # Check grad exists. The verts are detached from the loaded verts,
+        # which are shared with other tests and must not require grad.
+        verts = mesh.verts_list()[0].detach().requires_grad_(True)
         mesh2 = Meshes(verts=[verts], faces=mesh.faces_list(), textures=mesh.textures)
         images = renderer(mesh2)
         images[0, ...].sum().backward()
@@ -469,22 +614,24 @@ class TestRenderMeshes(TestCaseMixin, unittest.TestCase):
         lights.location = torch.tensor([0.0, 0.0, -2.0], device=device)[None]
 
         # Load reference image
-        image_ref = load_rgb_image("test_texture_map_front.png", DATA_DIR)
+        image_ref = self._load_ref_image("test_texture_map_front.png", device)
 
-        for bin_size in [0, None]:
+        for bin_size in _bin_sizes():
             # Check both naive and coarse to fine produce the same output.
             renderer.rasterizer.raster_settings.bin_size = bin_size
 
-            images = renderer(mesh, cameras=cameras, lights=lights)
-            rgb = images[0, ..., :3].squeeze().cpu()
+            with torch.no_grad():
+                images = renderer(mesh, cameras=cameras, lights=lights)
+            rgb = images[0, ..., :3].squeeze()
 
             if DEBUG:
-                Image.fromarray((rgb.numpy() * 255).astype(np.uint8)).save(
+                Image.fromarray(_to_uint8_image(rgb)).save(
                     DATA_DIR / "DEBUG_texture_map_front.png"
                 )
 
             # NOTE some pixels can be flaky and will not lead to
-            # `cond1` being true. Add `cond2` and check `cond1 or cond2`
+            # `cond1` being true. Add `cond2` and check `cond1 or cond2`.
+            # Both are computed on the GPU, only the results are synced.
             cond1 = torch.allclose(rgb, image_ref, atol=0.05)
             cond2 = ((rgb - image_ref).abs() > 0.05).sum() < 5
             self.assertTrue(cond1 or cond2)
@@ -503,31 +650,35 @@ class TestRenderMeshes(TestCaseMixin, unittest.TestCase):
         )
 
         # Load reference image
-        image_ref = load_rgb_image("test_blurry_textured_rendering.png", DATA_DIR)
+        image_ref = self._load_ref_image("test_blurry_textured_rendering.png", device)
 
-        for bin_size in [0, None]:
+        for bin_size in _bin_sizes():
             # Check both naive and coarse to fine produce the same output.
-            renderer.rasterizer.raster_settings.bin_size = bin_size
+            # The raster settings passed as a kwarg override the renderer's
+            # settings, so set the bin size on them directly.
+            raster_settings.bin_size = bin_size
 
-            images = renderer(
-                mesh.clone(),
-                cameras=cameras,
-                raster_settings=raster_settings,
-                blend_params=blend_params,
-            )
-            rgb = images[0, ..., :3].squeeze().cpu()
+            with torch.no_grad():
+                images = renderer(
+                    mesh,
+                    cameras=cameras,
+                    raster_settings=raster_settings,
+                    blend_params=blend_params,
+                )
+            rgb = images[0, ..., :3].squeeze()
 
             if DEBUG:
-                Image.fromarray((rgb.numpy() * 255).astype(np.uint8)).save(
+                Image.fromarray(_to_uint8_image(rgb)).save(
                     DATA_DIR / "DEBUG_blurry_textured_rendering.png"
                 )
 
             self.assertClose(rgb, image_ref, atol=0.05)
 
+    @torch.no_grad()
     def test_batch_uvs(self):
         """Test that two random tori with TexturesUV render the same as each individually."""
         torch.manual_seed(1)
-        device = torch.device("cuda:0")
+        device = DEVICE
         plain_torus = torus(r=1, R=4, sides=10, rings=10, device=device)
         [verts] = plain_torus.verts_list()
         [faces] = plain_torus.faces_list()
@@ -553,8 +704,13 @@ class TestRenderMeshes(TestCaseMixin, unittest.TestCase):
         R, T = look_at_view_transform(10, 10, 0)
         cameras = FoVPerspectiveCameras(device=device, R=R, T=T)
 
+        # A bin can not hold more faces than the torus has.
         raster_settings = RasterizationSettings(
-            image_size=128, blur_radius=0.0, faces_per_pixel=1
+            image_size=128,
+            blur_radius=0.0,
+            faces_per_pixel=1,
+            bin_size=None,
+            max_faces_per_bin=faces.shape[0],
         )
 
         # Init shader settings
@@ -574,36 +730,42 @@ class TestRenderMeshes(TestCaseMixin, unittest.TestCase):
             ),
         )
 
-        outputs = []
-        for meshes in [mesh_both, mesh1, mesh2]:
-            outputs.append(renderer(meshes))
+        # mesh1 and mesh2 only differ in their textures, so the individual
+        # renders shade the same fragments rather than rasterizing twice.
+        fragments = renderer.rasterizer(mesh1)
+        outputs = [
+            renderer(mesh_both),
+            renderer.shader(fragments, mesh1),
+            renderer.shader(fragments, mesh2),
+        ]
 
         if DEBUG:
-            Image.fromarray(
-                (outputs[0][0, ..., :3].cpu().numpy() * 255).astype(np.uint8)
-            ).save(DATA_DIR / "test_batch_uvs0.png")
-            Image.fromarray(
-                (outputs[1][0, ..., :3].cpu().numpy() * 255).astype(np.uint8)
-            ).save(DATA_DIR / "test_batch_uvs1.png")
-            Image.fromarray(
-                (outputs[0][1, ..., :3].cpu().numpy() * 255).astype(np.uint8)
-            ).save(DATA_DIR / "test_batch_uvs2.png")
-            Image.fromarray(
-                (outputs[2][0, ..., :3].cpu().numpy() * 255).astype(np.uint8)
-            ).save(DATA_DIR / "test_batch_uvs3.png")
+            Image.fromarray(_to_uint8_image(outputs[0][0, ..., :3])).save(
+                DATA_DIR / "test_batch_uvs0.png"
+            )
+            Image.fromarray(_to_uint8_image(outputs[1][0, ..., :3])).save(
+                DATA_DIR / "test_batch_uvs1.png"
+            )
+            Image.fromarray(_to_uint8_image(outputs[0][1, ..., :3])).save(
+                DATA_DIR / "test_batch_uvs2.png"
+            )
+            Image.fromarray(_to_uint8_image(outputs[2][0, ..., :3])).save(
+                DATA_DIR / "test_batch_uvs3.png"
+            )
 
             diff = torch.abs(outputs[0][0, ..., :3] - outputs[1][0, ..., :3])
-            Image.fromarray(((diff > 1e-5).cpu().numpy().astype(np.uint8) * 255)).save(
+            Image.fromarray(_to_uint8_image((diff > 1e-5).float())).save(
                 DATA_DIR / "test_batch_uvs01.png"
             )
             diff = torch.abs(outputs[0][1, ..., :3] - outputs[2][0, ..., :3])
-            Image.fromarray(((diff > 1e-5).cpu().numpy().astype(np.uint8) * 255)).save(
+            Image.fromarray(_to_uint8_image((diff > 1e-5).float())).save(
                 DATA_DIR / "test_batch_uvs23.png"
             )
 
         self.assertClose(outputs[0][0, ..., :3], outputs[1][0, ..., :3], atol=1e-5)
         self.assertClose(outputs[0][1, ..., :3], outputs[2][0, ..., :3], atol=1e-5)
 
+    @torch.no_grad()
     def test_join_uvs(self):
         """Meshes with TexturesUV joined into a scene"""
         # Test the result of rendering three tori with separate textures.
@@ -611,32 +773,9 @@ class TestRenderMeshes(TestCaseMixin, unittest.TestCase):
         # This tests TexturesUV.join_scene with rectangle flipping,
         # and we check the form of the merged map as well.
         torch.manual_seed(1)
-        device = torch.device("cuda:0")
-
-        R, T = look_at_view_transform(18, 0, 0)
-        cameras = FoVPerspectiveCameras(device=device, R=R, T=T)
+        device = DEVICE
 
-        raster_settings = RasterizationSettings(
-            image_size=256, blur_radius=0.0, faces_per_pixel=1
-        )
-
-        lights = PointLights(
-            device=device,
-            ambient_color=((1.0, 1.0, 1.0),),
-            diffuse_color=((0.0, 0.0, 0.0),),
-            specular_color=((0.0, 0.0, 0.0),),
-        )
-        blend_params = BlendParams(
-            sigma=1e-1,
-            gamma=1e-4,
-            background_color=torch.tensor([1.0, 1.0, 1.0], device=device),
-        )
-        renderer = MeshRenderer(
-            rasterizer=MeshRasterizer(cameras=cameras, raster_settings=raster_settings),
-            shader=HardPhongShader(
-                device=device, blend_params=blend_params, cameras=cameras, lights=lights
-            ),
-        )
+        renderer = self._ambient_renderer(device, image_size=256)
 
         plain_torus = torus(r=1, R=4, sides=5, rings=6, device=device)
         [verts] = plain_torus.verts_list()
@@ -693,60 +832,55 @@ class TestRenderMeshes(TestCaseMixin, unittest.TestCase):
             mesh3 = Meshes(verts=[verts_shifted2], faces=[faces], textures=textures3)
             mesh = join_meshes_as_scene([mesh1, mesh2, mesh3])
 
-            output = renderer(mesh)[0, ..., :3].cpu()
-            output1 = renderer(mesh1)[0, ..., :3].cpu()
-            output2 = renderer(mesh2)[0, ..., :3].cpu()
-            output3 = renderer(mesh3)[0, ..., :3].cpu()
+            output = renderer(mesh)[0, ..., :3]
+            output1 = renderer(mesh1)[0, ..., :3]
+            output2 = renderer(mesh2)[0, ..., :3]
+            output3 = renderer(mesh3)[0, ..., :3]
             # The background color is white and the objects do not overlap, so we can
             # predict the merged image by taking the minimum over every channel
             merged = torch.min(torch.min(output1, output2), output3)
 
-            image_ref = load_rgb_image(f"test_joinuvs{i}_final.png", DATA_DIR)
-            map_ref = load_rgb_image(f"test_joinuvs{i}_map.png", DATA_DIR)
+            image_ref = self._load_ref_image(f"test_joinuvs{i}_final.png", device)
+            map_ref = self._load_ref_image(f"test_joinuvs{i}_map.png", device)
 
             if DEBUG:
-                Image.fromarray((output.numpy() * 255).astype(np.uint8)).save(
+                Image.fromarray(_to_uint8_image(output)).save(
                     DATA_DIR / f"test_joinuvs{i}_final_.png"
                 )
-                Image.fromarray((output.numpy() * 255).astype(np.uint8)).save(
+                Image.fromarray(_to_uint8_image(output)).save(
                     DATA_DIR / f"test_joinuvs{i}_merged.png"
                 )
 
-                Image.fromarray((output1.numpy() * 255).astype(np.uint8)).save(
+                Image.fromarray(_to_uint8_image(output1)).save(
                     DATA_DIR / f"test_joinuvs{i}_1.png"
                 )
-                Image.fromarray((output2.numpy() * 255).astype(np.uint8)).save(
+                Image.fromarray(_to_uint8_image(output2)).save(
                     DATA_DIR / f"test_joinuvs{i}_2.png"
                 )
-                Image.fromarray((output3.numpy() * 255).astype(np.uint8)).save(
+                Image.fromarray(_to_uint8_image(output3)).save(
                     DATA_DIR / f"test_joinuvs{i}_3.png"
                 )
-                Image.fromarray(
-                    (mesh.textures.maps_padded()[0].cpu().numpy() * 255).astype(
-                        np.uint8
-                    )
-                ).save(DATA_DIR / f"test_joinuvs{i}_map_.png")
-                Image.fromarray(
-                    (mesh2.textures.maps_padded()[0].cpu().numpy() * 255).astype(
-                        np.uint8
-                    )
-                ).save(DATA_DIR / f"test_joinuvs{i}_map2.png")
-                Image.fromarray(
-                    (mesh3.textures.maps_padded()[0].cpu().numpy() * 255).astype(
-                        np.uint8
-                    )
-                ).save(DATA_DIR / f"test_joinuvs{i}_map3.png")
+                Image.fromarray(_to_uint8_image(mesh.textures.maps_padded()[0])).save(
+                    DATA_DIR / f"test_joinuvs{i}_map_.png"
+                )
+                Image.fromarray(_to_uint8_image(mesh2.textures.maps_padded()[0])).save(
+                    DATA_DIR / f"test_joinuvs{i}_map2.png"
+                )
+                Image.fromarray(_to_uint8_image(mesh3.textures.maps_padded()[0])).save(
+                    DATA_DIR / f"test_joinuvs{i}_map3.png"
+                )
 
             self.assertClose(output, merged, atol=0.015)
             self.assertClose(output, image_ref, atol=0.05)
-            self.assertClose(mesh.textures.maps_padded()[0].cpu(), map_ref, atol=0.05)
+            self.assertClose(mesh.textures.maps_padded()[0], map_ref, atol=0.05)
 
+    @torch.no_grad()
     def test_join_verts(self):
         """Meshes with TexturesVertex joined into a scene"""
         # Test the result of rendering two tori with separate textures.
         # The expected result is consistent with rendering them each alone.
         torch.manual_seed(1)
-        device = torch.device("cuda:0")
+        device = DEVICE
         plain_torus = torus(r=1, R=4, sides=5, rings=6, device=device)
         [verts] = plain_torus.verts_list()
         verts_shifted1 = verts.clone()
@@ -760,58 +894,25 @@ class TestRenderMeshes(TestCaseMixin, unittest.TestCase):
         mesh2 = Meshes(verts=[verts_shifted1], faces=faces, textures=textures2)
         mesh = join_meshes_as_scene([mesh1, mesh2])
 
-        R, T = look_at_view_transform(18, 0, 0)
-        cameras = FoVPerspectiveCameras(device=device, R=R, T=T)
-
-        raster_settings = RasterizationSettings(
-            image_size=256, blur_radius=0.0, faces_per_pixel=1
-        )
-
-        lights = PointLights(
-            device=device,
-            ambient_color=((1.0, 1.0, 1.0),),
-            diffuse_color=((0.0, 0.0, 0.0),),
-            specular_color=((0.0, 0.0, 0.0),),
-        )
-        blend_params = BlendParams(
-            sigma=1e-1,
-            gamma=1e-4,
-            background_color=torch.tensor([1.0, 1.0, 1.0], device=device),
-        )
-        renderer = MeshRenderer(
-            rasterizer=MeshRasterizer(cameras=cameras, raster_settings=raster_settings),
-            shader=HardPhongShader(
-                device=device, blend_params=blend_params, cameras=cameras, lights=lights
-            ),
-        )
+        renderer = self._ambient_renderer(device, image_size=256)
 
         output = renderer(mesh)
 
-        image_ref = load_rgb_image("test_joinverts_final.png", DATA_DIR)
+        image_ref = self._load_ref_image("test_joinverts_final.png", device)
 
         if DEBUG:
-            debugging_outputs = []
-            for mesh_ in [mesh1, mesh2]:
-                debugging_outputs.append(renderer(mesh_))
-            Image.fromarray(
-                (output[0, ..., :3].cpu().numpy() * 255).astype(np.uint8)
-            ).save(DATA_DIR / "test_joinverts_final_.png")
-            Image.fromarray(
-                (debugging_outputs[0][0, ..., :3].cpu().numpy() * 255).astype(np.uint8)
-            ).save(DATA_DIR / "test_joinverts_1.png")
-            Image.fromarray(
-                (debugging_outputs[1][0, ..., :3].cpu().numpy() * 255).astype(np.uint8)
-            ).save(DATA_DIR / "test_joinverts_2.png")
-
-        result = output[0, ..., :3].cpu()
+            _save_join_debug_images(renderer, output, [mesh1, mesh2], "test_joinverts")
+
+        result = output[0, ..., :3]
         self.assertClose(result, image_ref, atol=0.05)
 
+    @torch.no_grad()
     def test_join_atlas(self):
         """Meshes with TexturesAtlas joined into a scene"""
         # Test the result of rendering two tori with separate textures.
         # The expected result is consistent with rendering them each alone.
         torch.manual_seed(1)
-        device = torch.device("cuda:0")
+        device = DEVICE
         plain_torus = torus(r=1, R=4, sides=5, rings=6, device=device)
         [verts] = plain_torus.verts_list()
         verts_shifted1 = verts.clone()
@@ -827,12 +928,15 @@ class TestRenderMeshes(TestCaseMixin, unittest.TestCase):
         # The averaging of the random numbers here is not consistent with the
         # meaning of the atlases, but makes each face a bit smoother than
         # if everything had a random color.
-        atlas1 = torch.rand(size=(faces.shape[0], map_size, map_size, 3), device=device)
-        atlas1[:, 1] = 0.5 * atlas1[:, 0] + 0.5 * atlas1[:, 2]
-        atlas1[:, :, 1] = 0.5 * atlas1[:, :, 0] + 0.5 * atlas1[:, :, 2]
-        atlas2 = torch.rand(size=(faces.shape[0], map_size, map_size, 3), device=device)
-        atlas2[:, 1] = 0.5 * atlas2[:, 0] + 0.5 * atlas2[:, 2]
-        atlas2[:, :, 1] = 0.5 * atlas2[:, :, 0] + 0.5 * atlas2[:, :, 2]
+        # Both atlases are smoothed together, which halves the number of
+        # small kernels without changing the random values.
+        atlas_size = (faces.shape[0], map_size, map_size, 3)
+        atlases = torch.stack(
+            [torch.rand(size=atlas_size, device=device) for _ in range(2)]
+        )
+        atlases[:, :, 1] = 0.5 * atlases[:, :, 0] + 0.5 * atlases[:, :, 2]
+        atlases[:, :, :, 1] = 0.5 * atlases[:, :, :, 0] + 0.5 * atlases[:, :, :, 2]
+        atlas1, atlas2 = atlases
 
         textures1 = TexturesAtlas(atlas=[atlas1])
         textures2 = TexturesAtlas(atlas=[atlas2])
@@ -840,59 +944,26 @@ class TestRenderMeshes(TestCaseMixin, unittest.TestCase):
         mesh2 = Meshes(verts=[verts_shifted1], faces=[faces], textures=textures2)
         mesh_joined = join_meshes_as_scene([mesh1, mesh2])
 
-        R, T = look_at_view_transform(18, 0, 0)
-        cameras = FoVPerspectiveCameras(device=device, R=R, T=T)
-
-        raster_settings = RasterizationSettings(
-            image_size=512, blur_radius=0.0, faces_per_pixel=1
-        )
-
-        lights = PointLights(
-            device=device,
-            ambient_color=((1.0, 1.0, 1.0),),
-            diffuse_color=((0.0, 0.0, 0.0),),
-            specular_color=((0.0, 0.0, 0.0),),
-        )
-        blend_params = BlendParams(
-            sigma=1e-1,
-            gamma=1e-4,
-            background_color=torch.tensor([1.0, 1.0, 1.0], device=device),
-        )
-        renderer = MeshRenderer(
-            rasterizer=MeshRasterizer(cameras=cameras, raster_settings=raster_settings),
-            shader=HardPhongShader(
-                device=device, blend_params=blend_params, cameras=cameras, lights=lights
-            ),
-        )
+        renderer = self._ambient_renderer(device, image_size=512)
 
         output = renderer(mesh_joined)
 
-        image_ref = load_rgb_image("test_joinatlas_final.png", DATA_DIR)
+        image_ref = self._load_ref_image("test_joinatlas_final.png", device)
 
         if DEBUG:
-            debugging_outputs = []
-            for mesh_ in [mesh1, mesh2]:
-                debugging_outputs.append(renderer(mesh_))
-            Image.fromarray(
-                (output[0, ..., :3].cpu().numpy() * 255).astype(np.uint8)
-            ).save(DATA_DIR / "test_joinatlas_final_.png")
-            Image.fromarray(
-                (debugging_outputs[0][0, ..., :3].cpu().numpy() * 255).astype(np.uint8)
-            ).save(DATA_DIR / "test_joinatlas_1.png")
-            Image.fromarray(
-                (debugging_outputs[1][0, ..., :3].cpu().numpy() * 255).astype(np.uint8)
-            ).save(DATA_DIR / "test_joinatlas_2.png")
-
-        result = output[0, ..., :3].cpu()
+            _save_join_debug_images(renderer, output, [mesh1, mesh2], "test_joinatlas")
+
+        result = output[0, ..., :3]
         self.assertClose(result, image_ref, atol=0.05)
 
+    @torch.no_grad()
     def test_joined_spheres(self):
         """
         Test a list of Meshes can be joined as a single mesh and
         the single mesh is rendered correctly with Phong, Gouraud
         and Flat Shaders.
         """
-        device = torch.device("cuda:0")
+        device = DEVICE
 
         # Init mesh with vertex textures.
         # Initialize a list containing two ico spheres of different sizes.
@@ -901,25 +972,31 @@ class TestRenderMeshes(TestCaseMixin, unittest.TestCase):
         # The scale the vertices need to be set at to resize the spheres
         scales = [0.25, 1]
         # The distance the spheres ought to be offset horizontally to prevent overlap.
-        offsets = [1.2, -0.3]
-        # Initialize a list containing the adjusted sphere meshes.
+        offsets = torch.tensor([[1.2, 0.0, 0.0], [-0.3, 0.0, 0.0]], device=device)
+        # Initialize a list containing the adjusted sphere meshes. The scale and
+        # offset are applied together as offset + scale * verts.
         sphere_mesh_list = []
         for i in range(len(sphere_list)):
-            verts = sphere_list[i].verts_padded() * scales[i]
-            verts[0, :, 0] += offsets[i]
+            [verts] = sphere_list[i].verts_list()
+            verts = torch.add(offsets[i], verts, alpha=scales[i])
             sphere_mesh_list.append(
-                Meshes(verts=verts, faces=sphere_list[i].faces_padded())
+                Meshes(verts=[verts], faces=sphere_list[i].faces_list())
             )
         joined_sphere_mesh = join_meshes_as_scene(sphere_mesh_list)
-        joined_sphere_mesh.textures = TexturesVertex(
-            verts_features=torch.ones_like(joined_sphere_mesh.verts_padded())
+        joined_sphere_mesh.textures = self._white_textures(
+            joined_sphere_mesh.verts_padded()
         )
 
         # Init rasterizer settings
         R, T = look_at_view_transform(2.7, 0.0, 0.0)
         cameras = FoVPerspectiveCameras(device=device, R=R, T=T)
+        # A bin can not hold more faces than the joined mesh has.
         raster_settings = RasterizationSettings(
-            image_size=512, blur_radius=0.0, faces_per_pixel=1
+            image_size=512,
+            blur_radius=0.0,
+            faces_per_pixel=1,
+            bin_size=None,
+            max_faces_per_bin=joined_sphere_mesh.faces_packed().shape[0],
         )
 
         # Init shader settings
@@ -935,6 +1012,8 @@ class TestRenderMeshes(TestCaseMixin, unittest.TestCase):
             "gouraud": HardGouraudShader,
             "flat": HardFlatShader,
         }
+        # All the shaders shade the same fragments, so rasterize only once.
+        fragments = rasterizer(joined_sphere_mesh)
         for (name, shader_init) in shaders.items():
             shader = shader_init(
                 lights=lights,
@@ -942,34 +1021,25 @@ class TestRenderMeshes(TestCaseMixin, unittest.TestCase):
                 materials=materials,
                 blend_params=blend_params,
             )
-            renderer = MeshRenderer(rasterizer=rasterizer, shader=shader)
-            image = renderer(joined_sphere_mesh)
-            rgb = image[..., :3].squeeze().cpu()
+            image = shader(fragments, joined_sphere_mesh)
+            rgb = image[..., :3].squeeze()
             if DEBUG:
                 file_name = "DEBUG_joined_spheres_%s.png" % name
-                Image.fromarray((rgb.numpy() * 255).astype(np.uint8)).save(
-                    DATA_DIR / file_name
-                )
-            image_ref = load_rgb_image("test_joined_spheres_%s.png" % name, DATA_DIR)
+                Image.fromarray(_to_uint8_image(rgb)).save(DATA_DIR / file_name)
+            image_ref = self._load_ref_image(
+                "test_joined_spheres_%s.png" % name, device
+            )
             self.assertClose(rgb, image_ref, atol=0.05)
 
+    @torch.no_grad()
     def test_texture_map_atlas(self):
         """
         Test a mesh with a texture map as a per face atlas is loaded and rendered correctly.
         """
-        device = torch.device("cuda:0")
-        obj_dir = Path(__file__).resolve().parent.parent / "docs/tutorials/data"
-        obj_filename = obj_dir / "cow_mesh/cow.obj"
+        device = DEVICE
 
         # Load mesh and texture as a per face texture atlas.
-        verts, faces, aux = load_obj(
-            obj_filename,
-            device=device,
-            load_textures=True,
-            create_texture_atlas=True,
-            texture_atlas_size=8,
-            texture_wrap=None,
-        )
+        verts, faces, aux = self._load_cow(device)
         mesh = Meshes(
             verts=[verts],
             faces=[faces.verts_idx],
@@ -980,8 +1050,14 @@ class TestRenderMeshes(TestCaseMixin, unittest.TestCase):
         R, T = look_at_view_transform(2.7, 0, 0)
         cameras = FoVPerspectiveCameras(device=device, R=R, T=T)
 
+        # A bin can not hold more faces than the cow has.
         raster_settings = RasterizationSettings(
-            image_size=512, blur_radius=0.0, faces_per_pixel=1, cull_backfaces=True
+            image_size=512,
+            blur_radius=0.0,
+            faces_per_pixel=1,
+            cull_backfaces=True,
+            bin_size=None,
+            max_faces_per_bin=faces.verts_idx.shape[0],
         )
 
         # Init shader settings
@@ -999,18 +1075,19 @@ class TestRenderMeshes(TestCaseMixin, unittest.TestCase):
         )
 
         images = renderer(mesh)
-        rgb = images[0, ..., :3].squeeze().cpu()
+        rgb = images[0, ..., :3].squeeze()
 
         # Load reference image
-        image_ref = load_rgb_image("test_texture_atlas_8x8_back.png", DATA_DIR)
+        image_ref = self._load_ref_image("test_texture_atlas_8x8_back.png", device)
 
         if DEBUG:
-            Image.fromarray((rgb.numpy() * 255).astype(np.uint8)).save(
+            Image.fromarray(_to_uint8_image(rgb)).save(
                 DATA_DIR / "DEBUG_texture_atlas_8x8_back.png"
             )
 
         self.assertClose(rgb, image_ref, atol=0.05)
 
+    @torch.no_grad()
     def test_simple_sphere_outside_zfar(self):
         """
         Test output when rendering a sphere that is beyond zfar with a SoftPhongShader.
@@ -1020,14 +1097,13 @@ class TestRenderMeshes(TestCaseMixin, unittest.TestCase):
         zfar, 2) make sure there are no numerical precision/overflow errors associated
         with larger world coordinates
         """
-        device = torch.device("cuda:0")
+        device = DEVICE
 
         # Init mesh
-        sphere_mesh = ico_sphere(5, device)
+        sphere_mesh = self._ico_sphere(device)
         verts_padded = sphere_mesh.verts_padded() * 500
         faces_padded = sphere_mesh.faces_padded()
-        feats = torch.ones_like(verts_padded, device=device)
-        textures = TexturesVertex(verts_features=feats)
+        textures = self._white_textures(verts_padded)
         sphere_mesh = Meshes(verts=verts_padded, faces=faces_padded, textures=textures)
 
         R, T = look_at_view_transform(1500, 0.0, 0.0)
@@ -1057,16 +1133,46 @@ class TestRenderMeshes(TestCaseMixin, unittest.TestCase):
             )
             renderer = MeshRenderer(rasterizer=rasterizer, shader=shader)
             images = renderer(sphere_mesh)
-            rgb = images[0, ..., :3].squeeze().cpu()
+            rgb = images[0, ..., :3].squeeze()
 
             filename = "test_simple_sphere_outside_zfar_%d.png" % int(zfar)
 
             # Load reference image
-            image_ref = load_rgb_image(filename, DATA_DIR)
+            image_ref = self._load_ref_image(filename, device)
 
             if DEBUG:
-                Image.fromarray((rgb.numpy() * 255).astype(np.uint8)).save(
+                Image.fromarray(_to_uint8_image(rgb)).save(
                     DATA_DIR / ("DEBUG_" + filename)
                 )
 
             self.assertClose(rgb, image_ref, atol=0.05)
+
+
+def _make_simple_sphere_test(cam_type, elevated_camera, check_depth):
+    def test(self):
+        self._check_simple_sphere(
+            cam_type, elevated_camera=elevated_camera, check_depth=check_depth
+        )
+
+    return test
+
+
+# Add one test per camera type and sphere test variant, rather than looping
+# over the camera types in a single test, so that test runners can run them
+# in parallel.
+for _cam_type in (
+    FoVPerspectiveCameras,
+    FoVOrthographicCameras,
+    PerspectiveCameras,
+    OrthographicCameras,
+):
+    for _suffix, _elevated_camera, _check_depth in (
+        ("", False, False),
+        ("_elevated_camera", True, False),
+        ("_depth", False, True),
+    ):
+        setattr(
+            TestRenderMeshes,
+            "test_simple_sphere%s_%s" % (_suffix, _cam_type.__name__),
+            _make_simple_sphere_test(_cam_type, _elevated_camera, _check_depth),
+        )
@@ -335,9 +335,18 @@ class TestRenderPoints(TestCaseMixin, unittest.TestCase):
 
             compositor = compositor_class(background_color)
 
+            # the background color is not part of the module state
+            self.assertEqual(len(compositor.state_dict()), 0)
+
             # run the forward method to generate masked images
             masked_images = compositor.forward(pix_idxs, alphas, ptclds)
 
+            # the converted background color is reused in later forward passes
+            cached = compositor._background_color_cache[2]
+            masked_images_2 = compositor.forward(pix_idxs, alphas, ptclds)
+            self.assertIs(compositor._background_color_cache[2], cached)
+            self.assertClose(masked_images_2, masked_images)
+
             # generate unmasked images for testing purposes
             images = composite_func(pix_idxs, alphas, ptclds)
 
@@ -368,3 +377,12 @@ class TestRenderPoints(TestCaseMixin, unittest.TestCase):
             self.assertTrue(
                 masked_images[is_background].view(-1, 4)[..., 3].eq(1).all()
             )
+
+            # changing the background color of the compositor is picked up
+            new_background_color = [0.25, 0.5, 0.75]
+            compositor.background_color = new_background_color
+            masked_images = compositor.forward(pix_idxs, alphas, ptclds)
+            masked_images = masked_images.permute(0, 2, 3, 1)
+            background_pixels = masked_images[is_background].view(-1, 4)
+            expected = torch.tensor(new_background_color + [1.0])
+            self.assertTrue(background_pixels.eq(expected).all())
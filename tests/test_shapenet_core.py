@@ -4,6 +4,7 @@ Sanity checks for loading ShapeNetCore.
 """
 import os
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import numpy as np
@@ -29,6 +30,31 @@ DEBUG = False
 DATA_DIR = Path(__file__).resolve().parent / "data"
 
 
+def _subdirs(path):
+    """
+    Return the names of the directories directly inside path. os.scandir gets
+    the entry types while listing the directory, so no extra stat calls are
+    needed to tell directories apart from files.
+    """
+    with os.scandir(path) as entries:
+        return [entry.name for entry in entries if entry.is_dir()]
+
+
+def _count_subdirs(path) -> int:
+    return len(_subdirs(path))
+
+
+def _count_models(synsets) -> int:
+    """
+    Count the model directories in the given synsets of SHAPENET_PATH. The
+    synsets are listed in parallel, as the time is spent waiting on the file
+    system with the GIL released.
+    """
+    paths = [os.path.join(SHAPENET_PATH, synset) for synset in synsets]
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        return sum(executor.map(_count_subdirs, paths))
+
+
 class TestShapenetCore(TestCaseMixin, unittest.TestCase):
     def setUp(self):
         """
@@ -61,17 +87,9 @@ class TestShapenetCore(TestCaseMixin, unittest.TestCase):
         # Count the number of grandchildren directories (which should be equal to
         # the total number of objects in the dataset) by walking through the given
         # directory.
-        wnsynset_list = [
-            wnsynset
-            for wnsynset in os.listdir(SHAPENET_PATH)
-            if os.path.isdir(os.path.join(SHAPENET_PATH, wnsynset))
-        ]
-        model_num_list = [
-            (len(next(os.walk(os.path.join(SHAPENET_PATH, wnsynset)))[1]))
-            for wnsynset in wnsynset_list
-        ]
+        wnsynset_list = _subdirs(SHAPENET_PATH)
         # Check total number of objects in the dataset is correct.
-        self.assertEqual(len(shapenet_dataset), sum(model_num_list))
+        self.assertEqual(len(shapenet_dataset), _count_models(wnsynset_list))
 
         # Randomly retrieve an object from the dataset.
         rand_obj = shapenet_dataset[torch.randint(len(shapenet_dataset), (1,))]
@@ -106,11 +124,7 @@ class TestShapenetCore(TestCaseMixin, unittest.TestCase):
             "03991062",
             "04460130",
         ]
-        subset_model_nums = [
-            (len(next(os.walk(os.path.join(SHAPENET_PATH, offset)))[1]))
-            for offset in subset_offsets
-        ]
-        self.assertEqual(len(shapenet_subset), sum(subset_model_nums))
+        self.assertEqual(len(shapenet_subset), _count_models(subset_offsets))
 
     def test_collate_models(self):
         """